@@ -21,7 +21,7 @@ import sys
 import time
 import logging
 import argparse
-import subprocess
+import importlib
 from pathlib import Path
 
 # Configure logging
@@ -36,39 +36,26 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 def run_step(script_name, step_description):
-    """Run a single step of the pipeline."""
+    """Run a single step of the pipeline in-process by calling the step module's main()."""
     logger.info(f"\n{'='*60}")
     logger.info(f"Starting: {step_description}")
     logger.info(f"Running: {script_name}")
     logger.info('='*60)
     
-    start_time = time.time()
+    start_time = time.perf_counter()
     
     try:
-        # Run the step script
-        result = subprocess.run([sys.executable, script_name], 
-                              capture_output=True, text=True, check=True)
+        # Import the step module and run it, avoiding a fresh interpreter per step
+        step_module = importlib.import_module(Path(script_name).stem)
+        step_module.main()
         
-        # Log the output
-        if result.stdout:
-            logger.info("Script output:")
-            for line in result.stdout.strip().split('\n'):
-                logger.info(f"  {line}")
-                
-        elapsed = time.time() - start_time
+        elapsed = time.perf_counter() - start_time
         logger.info(f"✓ Completed: {step_description} ({elapsed:.1f}s)")
         return True
         
-    except subprocess.CalledProcessError as e:
-        logger.error(f"✗ Failed: {step_description}")
-        logger.error(f"Error code: {e.returncode}")
-        if e.stdout:
-            logger.error(f"Stdout: {e.stdout}")
-        if e.stderr:
-            logger.error(f"Stderr: {e.stderr}")
-        return False
     except Exception as e:
-        logger.error(f"✗ Unexpected error in {step_description}: {e}")
+        logger.error(f"✗ Failed: {step_description}")
+        logger.error(f"Error: {e}", exc_info=True)
         return False
 
 def check_prerequisites():
@@ -200,12 +187,17 @@ Examples:
                        help='Minimum file size in bytes to keep (default: 200)')
     parser.add_argument('--verbose', '-v', action='store_true',
                        help='Enable verbose logging')
+    parser.add_argument('--copy-files', action='store_true',
+                       help='Copy files into intermediate directories instead of hard-linking them')
     
     args = parser.parse_args()
     
     if args.verbose:
         logging.getLogger().setLevel(logging.DEBUG)
     
+    if args.copy_files:
+        os.environ['WSLTC_COPY_FILES'] = '1'
+    
     # Parse steps to run
     try:
         steps_to_run = [int(x.strip()) for x in args.steps.split(',')]
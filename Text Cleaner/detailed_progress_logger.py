@@ -8,26 +8,146 @@ and comprehensive reviews at the end of each step.
 Author: Willow Groundwater-Schuldt & Claude Code 🫸💥🫷
 """
 
+import io
+import sys
+import queue
 import time
+import json
+import array
+import heapq
+import functools
 import logging
+import logging.handlers
 import os
 import re
 from pathlib import Path
 from typing import Dict, List, Optional, Any
 from datetime import datetime, timedelta
 
+try:
+    import orjson  # optional, faster JSON encoding for the metrics sidecar
+except ImportError:
+    orjson = None
+
+# Roman numerals kept upper-case when formatting book titles
+ROMAN_NUMERALS = frozenset({
+    'I', 'II', 'III', 'IV', 'V', 'VI', 'VII', 'VIII', 'IX', 'X',
+    'XI', 'XII', 'XIII', 'XIV', 'XV', 'XX', 'XXX', 'XL', 'L',
+    'C', 'CI', 'CII', 'CIII'
+})
+
+# Size of the stdout buffer used for progress output
+STDOUT_BUFFER_SIZE = 64 * 1024
+
+def _install_buffered_stdout():
+    """
+    Route stdout through a 64 KiB buffered writer so the many progress print() calls
+    are written out in large blocks; output is flushed at book and step boundaries.
+    Set WSLTC_LOG_UNBUFFERED=1 to keep the interpreter's default stdout.
+    """
+    if os.environ.get('WSLTC_LOG_UNBUFFERED'):
+        return
+    
+    try:
+        fileno = sys.stdout.fileno()
+    except (AttributeError, ValueError, io.UnsupportedOperation):
+        return  # stdout is not a real file (e.g. captured by a test runner)
+    
+    sys.stdout.flush()
+    sys.stdout = io.TextIOWrapper(
+        open(fileno, 'wb', buffering=STDOUT_BUFFER_SIZE, closefd=False),
+        encoding='utf-8', line_buffering=False, write_through=False
+    )
+
+_install_buffered_stdout()
+
+class _ForkSafeQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that, in a forked worker process (where no listener thread runs),
+    hands records straight to the handlers the listener writes to.
+    """
+    
+    def __init__(self, log_queue, handlers):
+        super().__init__(log_queue)
+        self.target_handlers = handlers
+        self.owner_pid = os.getpid()
+    
+    def emit(self, record):
+        if os.getpid() == self.owner_pid:
+            super().emit(record)
+            return
+        for handler in self.target_handlers:
+            if record.levelno >= handler.level:
+                handler.handle(record)
+
+def start_log_queue(logger=None):
+    """
+    Move a logger's handlers (the root logger's by default, where basicConfig puts
+    them) behind a background QueueListener, so logging calls on the processing
+    path only enqueue their records. Call from a step's main() once logging is
+    configured and pass the result to stop_log_queue() when main() ends.
+    Returns None and leaves logging synchronous if WSLTC_LOG_UNBUFFERED is set.
+    """
+    logger = logger or logging.getLogger()
+    if os.environ.get('WSLTC_LOG_UNBUFFERED') or not logger.handlers:
+        return None
+    
+    handlers = logger.handlers[:]
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    logger.handlers = [_ForkSafeQueueHandler(log_queue, handlers)]
+    listener.start()
+    return listener
+
+def stop_log_queue(listener, logger=None):
+    """Drain the queue started by start_log_queue() and give the logger its handlers back."""
+    if listener is None:
+        return
+    listener.stop()
+    (logger or logging.getLogger()).handlers = list(listener.handlers)
+
+# Console verbosity: 1 prints milestones (book start/finish, step summaries) and
+# failures, 2 also prints per-operation detail. Override with WSLTC_VERBOSITY.
+DEFAULT_VERBOSITY = 2
+
+@functools.lru_cache(maxsize=None)
+def _parse_verbosity(value: str) -> int:
+    """Parse a WSLTC_VERBOSITY value, warning once and using the default if it isn't an integer."""
+    try:
+        return int(value)
+    except ValueError:
+        logging.getLogger(__name__).warning(
+            "Ignoring WSLTC_VERBOSITY=%r (not an integer); using %d", value, DEFAULT_VERBOSITY
+        )
+        return DEFAULT_VERBOSITY
+
+# Buffer size for the JSONL metrics sidecar
+METRICS_BUFFER_SIZE = 64 * 1024
+
+def _json_line(record: Dict[str, Any]) -> bytes:
+    """Encode one metrics record as a JSON line."""
+    if orjson is not None:
+        return orjson.dumps(record) + b'\n'
+    return json.dumps(record, ensure_ascii=False).encode('utf-8') + b'\n'
+
 class DetailedProgressLogger:
     """Enhanced progress logger that provides moment-by-moment processing details."""
     
+    # Banner rules shared by the step header and step summary
+    _RULE = "=" * 100
+    _THIN_RULE = "-" * 100
+    
     def __init__(self, step_name: str, step_description: str, total_files: int = 0):
         """Initialize the detailed progress logger."""
         self.step_name = step_name
         self.step_description = step_description
         self.total_files = total_files
         self.current_file_index = 0
-        self.step_start_time = time.time()
-        self.current_book_start_time = None
+        # Timing uses the monotonic clock in integer nanoseconds
+        self.step_start_ns = time.monotonic_ns()
+        self.current_book_start_ns = None
         self.current_book_name = None
+        self.verbosity = _parse_verbosity(os.environ.get('WSLTC_VERBOSITY', str(DEFAULT_VERBOSITY)))
         
         # Detailed statistics
         self.stats = {
@@ -48,24 +168,39 @@ class DetailedProgressLogger:
         
         # Detailed operation log
         self.operation_log = []
-        self.book_summaries = []
+        
+        # Per-book summaries, stored column-wise (one entry per book in each)
+        self._titles: List[str] = []
+        self._filenames: List[Optional[str]] = []
+        self._successes = array.array('b')
+        self._skipped = array.array('b')
+        self._elapsed = array.array('d')
+        self._lines = array.array('q')
+        self._operations = array.array('q')
+        self._summaries: List[str] = []
+        self._errors: List[str] = []  # error message, or skip reason for skipped books
         
         # Configure detailed logging
         self.logger = logging.getLogger(f"detailed_{step_name}")
         
+        # Optional machine-readable sidecar: one JSON line per book and per step.
+        # Set WSLTC_METRICS_FILE to a path to enable it.
+        metrics_path = os.environ.get('WSLTC_METRICS_FILE')
+        self._metrics_fp = open(metrics_path, 'ab', buffering=METRICS_BUFFER_SIZE) if metrics_path else None
+        
         # Print step start header
         self._print_step_header()
     
     def _print_step_header(self):
         """Print comprehensive step start header."""
-        print("\n" + "=" * 100)
+        print("\n" + self._RULE)
         print(f"🚀 STARTING STEP: {self.step_name.upper()}")
         print(f"📋 Description: {self.step_description}")
-        print("=" * 100)
+        print(self._RULE)
         print(f"📊 Total files to process: {self.total_files}")
         print(f"🕐 Started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         print(f"🎯 Expected completion: {self._estimate_completion_time()}")
-        print("-" * 100)
+        print(self._THIN_RULE)
     
     def _estimate_completion_time(self) -> str:
         """Estimate completion time based on file count."""
@@ -87,17 +222,21 @@ class DetailedProgressLogger:
         estimated_completion = datetime.now() + timedelta(seconds=estimated_seconds)
         return estimated_completion.strftime('%H:%M:%S')
     
-    def start_book_processing(self, filename: str, file_path: str = None) -> str:
-        """Start processing a new book with detailed information."""
+    def start_book_processing(self, filename: str, file_path: str = None,
+                              stat_result: Optional[os.stat_result] = None) -> str:
+        """
+        Start processing a new book with detailed information.
+        Pass stat_result (e.g. from DirEntry.stat()) to avoid re-stat'ing the file.
+        """
         self.current_file_index += 1
-        self.current_book_start_time = time.time()
+        self.current_book_start_ns = time.monotonic_ns()
         self.current_book_name = filename
         
         # Extract meaningful book title
         book_title = self._extract_meaningful_title(filename)
         
         # Get file information
-        file_info = self._get_file_info(file_path) if file_path else {}
+        file_info = self._get_file_info(file_path, stat_result) if file_path else {}
         
         # Progress percentage
         progress_pct = (self.current_file_index / self.total_files * 100) if self.total_files > 0 else 0
@@ -136,14 +275,15 @@ class DetailedProgressLogger:
             elif 'classif' in operation.lower():
                 self.stats['classifications_made'] += count
         
-        # Format the log message
-        log_msg = f"      {status_icon} {timestamp} | {operation}"
-        if details:
-            log_msg += f" | {details}"
-        if count > 0:
-            log_msg += f" | Count: {count}"
-        
-        print(log_msg)
+        # Format the log message (failures are shown at every verbosity)
+        if self.verbosity >= 2 or not success:
+            log_msg = f"      {status_icon} {timestamp} | {operation}"
+            if details:
+                log_msg += f" | {details}"
+            if count > 0:
+                log_msg += f" | Count: {count}"
+            
+            print(log_msg)
         
         # Store in operation log
         self.operation_log.append({
@@ -157,22 +297,25 @@ class DetailedProgressLogger:
     
     def log_text_analysis(self, original_text: str, processed_text: str, analysis_type: str):
         """Log detailed text analysis showing before/after comparisons."""
-        orig_lines = len(original_text.split('\n'))
-        proc_lines = len(processed_text.split('\n'))
-        
-        orig_chars = len(original_text)
-        proc_chars = len(processed_text)
-        
+        self.log_text_analysis_counts(
+            original_text.count('\n') + 1, processed_text.count('\n') + 1,
+            len(original_text), len(processed_text), analysis_type
+        )
+    
+    def log_text_analysis_counts(self, orig_lines: int, proc_lines: int,
+                                 orig_chars: int, proc_chars: int, analysis_type: str):
+        """Log a before/after comparison from precomputed line and character counts."""
         lines_changed = proc_lines - orig_lines
         chars_changed = proc_chars - orig_chars
         
-        print(f"      📊 {analysis_type} Analysis:")
-        print(f"         📝 Lines: {orig_lines} → {proc_lines} ({lines_changed:+d})")
-        print(f"         🔤 Characters: {orig_chars:,} → {proc_chars:,} ({chars_changed:+,})")
-        
-        if orig_chars > 0:
-            change_pct = (chars_changed / orig_chars) * 100
-            print(f"         📈 Change: {change_pct:+.2f}%")
+        if self.verbosity >= 2:
+            print(f"      📊 {analysis_type} Analysis:")
+            print(f"         📝 Lines: {orig_lines} → {proc_lines} ({lines_changed:+d})")
+            print(f"         🔤 Characters: {orig_chars:,} → {proc_chars:,} ({chars_changed:+,})")
+            
+            if orig_chars > 0:
+                change_pct = (chars_changed / orig_chars) * 100
+                print(f"         📈 Change: {change_pct:+.2f}%")
         
         # Update statistics
         self.stats['lines_processed'] += orig_lines
@@ -188,52 +331,61 @@ class DetailedProgressLogger:
     def log_pattern_matching(self, pattern_name: str, matches_found: int, sample_matches: List[str] = None):
         """Log detailed pattern matching results."""
         if matches_found == 0:
-            print(f"      🔍 {pattern_name}: No matches found")
+            if self.verbosity >= 2:
+                print(f"      🔍 {pattern_name}: No matches found")
             return
         
-        print(f"      🎯 {pattern_name}: {matches_found} matches found")
-        
-        if sample_matches and len(sample_matches) > 0:
-            print(f"         📋 Sample matches:")
-            for i, match in enumerate(sample_matches[:3]):  # Show first 3 matches
-                # Truncate long matches
-                display_match = match[:50] + "..." if len(match) > 50 else match
-                print(f"         • {display_match}")
+        if self.verbosity >= 2:
+            print(f"      🎯 {pattern_name}: {matches_found} matches found")
+            
+            if sample_matches and len(sample_matches) > 0:
+                print(f"         📋 Sample matches:")
+                for i, match in enumerate(sample_matches[:3]):  # Show first 3 matches
+                    # Truncate long matches
+                    display_match = match[:50] + "..." if len(match) > 50 else match
+                    print(f"         • {display_match}")
         
         self.stats['patterns_matched'] += matches_found
     
     def log_classification_result(self, book_title: str, classification: Dict[str, str], confidence: str = ""):
         """Log classification results with detailed breakdown."""
-        print(f"      🏷️  Classification Results:")
-        for category, value in classification.items():
-            print(f"         {category.title()}: {value}")
-        
-        if confidence:
-            print(f"         Confidence: {confidence}")
+        if self.verbosity >= 2:
+            print(f"      🏷️  Classification Results:")
+            for category, value in classification.items():
+                print(f"         {category.title()}: {value}")
+            
+            if confidence:
+                print(f"         Confidence: {confidence}")
         
         self.stats['classifications_made'] += 1
     
     def log_file_operation(self, operation: str, source_path: str = "", dest_path: str = "", success: bool = True):
         """Log file operations like moves, copies, deletions."""
         if success:
-            print(f"      📂 {operation}")
-            if source_path and dest_path:
-                print(f"         From: {source_path}")
-                print(f"         To: {dest_path}")
-            elif source_path:
-                print(f"         File: {source_path}")
+            if self.verbosity >= 2:
+                print(f"      📂 {operation}")
+                if source_path and dest_path:
+                    print(f"         From: {source_path}")
+                    print(f"         To: {dest_path}")
+                elif source_path:
+                    print(f"         File: {source_path}")
         else:
             print(f"      ❌ Failed: {operation}")
             if source_path:
                 print(f"         File: {source_path}")
     
     def finish_book_processing(self, success: bool = True, summary: str = "", 
-                             lines_processed: int = 0, operations_count: int = 0, error_msg: str = ""):
-        """Finish processing current book with detailed summary."""
-        if not self.current_book_start_time:
+                             lines_processed: int = 0, operations_count: int = 0, error_msg: str = "",
+                             elapsed_time: Optional[float] = None):
+        """
+        Finish processing current book with detailed summary.
+        Pass elapsed_time when the book was processed elsewhere (e.g. in a worker process).
+        """
+        if self.current_book_start_ns is None:
             return
         
-        elapsed_time = time.time() - self.current_book_start_time
+        if elapsed_time is None:
+            elapsed_time = (time.monotonic_ns() - self.current_book_start_ns) / 1e9
         book_title = self._extract_meaningful_title(self.current_book_name)
         
         # Update statistics
@@ -245,41 +397,45 @@ class DetailedProgressLogger:
         if lines_processed > 0:
             self.stats['lines_processed'] += lines_processed
         
-        # Print completion summary
+        # Print completion summary as a single write
+        out = []
         if success:
-            print(f"   ✅ COMPLETED: {book_title}")
-            print(f"      ⏱️  Processing time: {elapsed_time:.2f} seconds")
+            out.append(f"   ✅ COMPLETED: {book_title}")
+            out.append(f"      ⏱️  Processing time: {elapsed_time:.2f} seconds")
             
             if operations_count > 0:
-                print(f"      🔧 Operations performed: {operations_count}")
+                out.append(f"      🔧 Operations performed: {operations_count}")
             
             if lines_processed > 0:
                 lines_per_sec = lines_processed / elapsed_time if elapsed_time > 0 else 0
-                print(f"      📈 Processing rate: {lines_per_sec:.1f} lines/sec")
+                out.append(f"      📈 Processing rate: {lines_per_sec:.1f} lines/sec")
             
             if summary:
-                print(f"      📋 Summary: {summary}")
+                out.append(f"      📋 Summary: {summary}")
         else:
-            print(f"   ❌ FAILED: {book_title}")
-            print(f"      ⏱️  Time before failure: {elapsed_time:.2f} seconds")
+            out.append(f"   ❌ FAILED: {book_title}")
+            out.append(f"      ⏱️  Time before failure: {elapsed_time:.2f} seconds")
             if error_msg:
-                print(f"      💬 Error: {error_msg}")
+                out.append(f"      💬 Error: {error_msg}")
+        
+        sys.stdout.write('\n'.join(out) + '\n')
         
         # Store book summary
-        self.book_summaries.append({
-            'title': book_title,
-            'filename': self.current_book_name,
-            'success': success,
-            'elapsed_time': elapsed_time,
-            'lines_processed': lines_processed,
-            'operations_count': operations_count,
-            'summary': summary,
-            'error': error_msg
-        })
+        self._add_book_summary(book_title, self.current_book_name, success, False,
+                               elapsed_time, lines_processed, operations_count, summary, error_msg)
+        if self._metrics_fp is not None:
+            self._write_metrics({
+                'event': 'book', 'step': self.step_name, 'title': book_title,
+                'filename': self.current_book_name, 'success': success,
+                'elapsed_time': elapsed_time, 'lines_processed': lines_processed,
+                'operations_count': operations_count, 'error': error_msg or None
+            })
         
         # Reset current book tracking
-        self.current_book_start_time = None
+        self.current_book_start_ns = None
         self.current_book_name = None
+        
+        self._flush()
     
     def skip_book(self, reason: str = ""):
         """Mark current book as skipped with reason."""
@@ -292,114 +448,187 @@ class DetailedProgressLogger:
         self.stats['files_skipped'] += 1
         
         # Store in summaries
-        self.book_summaries.append({
-            'title': book_title,
-            'filename': self.current_book_name,
-            'success': False,
-            'skipped': True,
-            'reason': reason
-        })
+        self._add_book_summary(book_title, self.current_book_name, False, True, 0.0, 0, 0, "", reason)
+        if self._metrics_fp is not None:
+            self._write_metrics({
+                'event': 'skip', 'step': self.step_name, 'title': book_title,
+                'filename': self.current_book_name, 'reason': reason
+            })
+        
+        self._flush()
+    
+    def _add_book_summary(self, title: str, filename: Optional[str], success: bool, skipped: bool,
+                          elapsed_time: float, lines_processed: int, operations_count: int,
+                          summary: str, error: str):
+        """Append one book to the column-wise summaries."""
+        self._titles.append(title)
+        self._filenames.append(filename)
+        self._successes.append(bool(success))
+        self._skipped.append(skipped)
+        self._elapsed.append(elapsed_time)
+        self._lines.append(lines_processed)
+        self._operations.append(operations_count)
+        self._summaries.append(summary)
+        self._errors.append(error)
+    
+    @property
+    def book_summaries(self) -> List[Dict[str, Any]]:
+        """Per-book summaries as a list of dicts (built on demand)."""
+        books = []
+        for i, title in enumerate(self._titles):
+            if self._skipped[i]:
+                books.append({
+                    'title': title,
+                    'filename': self._filenames[i],
+                    'success': False,
+                    'skipped': True,
+                    'reason': self._errors[i]
+                })
+            else:
+                books.append({
+                    'title': title,
+                    'filename': self._filenames[i],
+                    'success': bool(self._successes[i]),
+                    'elapsed_time': self._elapsed[i],
+                    'lines_processed': self._lines[i],
+                    'operations_count': self._operations[i],
+                    'summary': self._summaries[i],
+                    'error': self._errors[i]
+                })
+        return books
     
     def print_step_summary(self):
         """Print comprehensive step completion summary with detailed review."""
-        total_elapsed = time.time() - self.step_start_time
+        total_elapsed = (time.monotonic_ns() - self.step_start_ns) / 1e9
         
-        print("\n" + "=" * 100)
-        print(f"🏁 STEP COMPLETED: {self.step_name.upper()}")
-        print("=" * 100)
+        # Build the whole report and emit it with a single write
+        out = []
+        out.append("\n" + self._RULE)
+        out.append(f"🏁 STEP COMPLETED: {self.step_name.upper()}")
+        out.append(self._RULE)
         
         # Basic statistics
-        print(f"📊 PROCESSING STATISTICS:")
-        print(f"   ✅ Files processed: {self.stats['files_processed']}")
+        out.append(f"📊 PROCESSING STATISTICS:")
+        out.append(f"   ✅ Files processed: {self.stats['files_processed']}")
         if self.stats['files_skipped'] > 0:
-            print(f"   ⏭️  Files skipped: {self.stats['files_skipped']}")
+            out.append(f"   ⏭️  Files skipped: {self.stats['files_skipped']}")
         if self.stats['files_failed'] > 0:
-            print(f"   ❌ Files failed: {self.stats['files_failed']}")
+            out.append(f"   ❌ Files failed: {self.stats['files_failed']}")
         
         total_files = self.stats['files_processed'] + self.stats['files_skipped'] + self.stats['files_failed']
         success_rate = (self.stats['files_processed'] / total_files * 100) if total_files > 0 else 0
-        print(f"   📈 Success rate: {success_rate:.1f}%")
+        out.append(f"   📈 Success rate: {success_rate:.1f}%")
         
         # Content statistics
         if self.stats['lines_processed'] > 0:
-            print(f"\n📝 CONTENT STATISTICS:")
-            print(f"   📄 Lines processed: {self.stats['lines_processed']:,}")
+            out.append(f"\n📝 CONTENT STATISTICS:")
+            out.append(f"   📄 Lines processed: {self.stats['lines_processed']:,}")
             if self.stats['lines_added'] > 0:
-                print(f"   ➕ Lines added: {self.stats['lines_added']:,}")
+                out.append(f"   ➕ Lines added: {self.stats['lines_added']:,}")
             if self.stats['lines_removed'] > 0:
-                print(f"   ➖ Lines removed: {self.stats['lines_removed']:,}")
+                out.append(f"   ➖ Lines removed: {self.stats['lines_removed']:,}")
         
         if self.stats['bytes_processed'] > 0:
-            print(f"   💾 Bytes processed: {self.stats['bytes_processed']:,}")
+            out.append(f"   💾 Bytes processed: {self.stats['bytes_processed']:,}")
             if self.stats['bytes_saved'] > 0:
-                print(f"   💰 Bytes saved: {self.stats['bytes_saved']:,}")
+                out.append(f"   💰 Bytes saved: {self.stats['bytes_saved']:,}")
         
         # Operation statistics
         if self.stats['operations_performed'] > 0:
-            print(f"\n🔧 OPERATION STATISTICS:")
-            print(f"   ⚙️  Total operations: {self.stats['operations_performed']:,}")
+            out.append(f"\n🔧 OPERATION STATISTICS:")
+            out.append(f"   ⚙️  Total operations: {self.stats['operations_performed']:,}")
             if self.stats['patterns_matched'] > 0:
-                print(f"   🎯 Patterns matched: {self.stats['patterns_matched']:,}")
+                out.append(f"   🎯 Patterns matched: {self.stats['patterns_matched']:,}")
             if self.stats['expansions_made'] > 0:
-                print(f"   📝 Expansions made: {self.stats['expansions_made']:,}")
+                out.append(f"   📝 Expansions made: {self.stats['expansions_made']:,}")
             if self.stats['classifications_made'] > 0:
-                print(f"   🏷️  Classifications made: {self.stats['classifications_made']:,}")
+                out.append(f"   🏷️  Classifications made: {self.stats['classifications_made']:,}")
         
         # Performance statistics
-        print(f"\n⏱️  PERFORMANCE STATISTICS:")
-        print(f"   🕐 Total time: {total_elapsed:.2f} seconds ({total_elapsed/60:.1f} minutes)")
+        out.append(f"\n⏱️  PERFORMANCE STATISTICS:")
+        out.append(f"   🕐 Total time: {total_elapsed:.2f} seconds ({total_elapsed/60:.1f} minutes)")
         
         if self.stats['files_processed'] > 0:
             avg_time = total_elapsed / self.stats['files_processed']
             files_per_minute = (self.stats['files_processed'] / total_elapsed) * 60
-            print(f"   📊 Average per file: {avg_time:.2f} seconds")
-            print(f"   🚀 Processing rate: {files_per_minute:.1f} files/minute")
+            out.append(f"   📊 Average per file: {avg_time:.2f} seconds")
+            out.append(f"   🚀 Processing rate: {files_per_minute:.1f} files/minute")
         
         # Top processed books (by processing time)
-        print(f"\n📚 BOOK PROCESSING SUMMARY:")
-        successful_books = [b for b in self.book_summaries if b.get('success', False)]
-        failed_books = [b for b in self.book_summaries if not b.get('success', False) and not b.get('skipped', False)]
-        skipped_books = [b for b in self.book_summaries if b.get('skipped', False)]
+        out.append(f"\n📚 BOOK PROCESSING SUMMARY:")
+        titles = self._titles
+        successful_books = [i for i, ok in enumerate(self._successes) if ok]
+        failed_books = [i for i, (ok, skipped) in enumerate(zip(self._successes, self._skipped))
+                        if not ok and not skipped]
+        skipped_books = [i for i, skipped in enumerate(self._skipped) if skipped]
         
         if successful_books:
-            print(f"   ✅ Successfully processed {len(successful_books)} books:")
+            out.append(f"   ✅ Successfully processed {len(successful_books)} books:")
             # Show top 5 by processing time
-            top_books = sorted(successful_books, key=lambda x: x.get('elapsed_time', 0), reverse=True)[:5]
-            for book in top_books:
-                elapsed = book.get('elapsed_time', 0)
-                lines = book.get('lines_processed', 0)
-                print(f"      📖 {book['title'][:50]:<50} ({elapsed:.2f}s, {lines} lines)")
+            top_books = heapq.nlargest(5, successful_books, key=self._elapsed.__getitem__)
+            for i in top_books:
+                out.append(f"      📖 {titles[i][:50]:<50} ({self._elapsed[i]:.2f}s, {self._lines[i]} lines)")
         
         if failed_books:
-            print(f"   ❌ Failed books ({len(failed_books)}):")
-            for book in failed_books[:5]:  # Show first 5 failures
-                error = book.get('error', 'Unknown error')[:80]
-                print(f"      📖 {book['title'][:40]:<40} | {error}")
+            out.append(f"   ❌ Failed books ({len(failed_books)}):")
+            for i in failed_books[:5]:  # Show first 5 failures
+                error = (self._errors[i] or '')[:80]
+                out.append(f"      📖 {titles[i][:40]:<40} | {error}")
         
         if skipped_books:
-            print(f"   ⏭️  Skipped books ({len(skipped_books)}):")
-            for book in skipped_books[:5]:  # Show first 5 skipped
-                reason = book.get('reason', 'No reason given')[:60]
-                print(f"      📖 {book['title'][:40]:<40} | {reason}")
+            out.append(f"   ⏭️  Skipped books ({len(skipped_books)}):")
+            for i in skipped_books[:5]:  # Show first 5 skipped
+                reason = (self._errors[i] or '')[:60]
+                out.append(f"      📖 {titles[i][:40]:<40} | {reason}")
         
         # Final completion message
-        print(f"\n🎯 STEP REVIEW:")
+        out.append(f"\n🎯 STEP REVIEW:")
         if success_rate >= 90:
-            print("   🌟 Excellent! Step completed with high success rate.")
+            out.append("   🌟 Excellent! Step completed with high success rate.")
         elif success_rate >= 70:
-            print("   👍 Good! Step completed successfully with minor issues.")
+            out.append("   👍 Good! Step completed successfully with minor issues.")
         elif success_rate >= 50:
-            print("   ⚠️  Acceptable! Step completed but with notable issues to review.")
+            out.append("   ⚠️  Acceptable! Step completed but with notable issues to review.")
         else:
-            print("   🚨 Poor! Step completed but requires immediate attention.")
+            out.append("   🚨 Poor! Step completed but requires immediate attention.")
+        
+        out.append(f"\n🔄 Ready to proceed to next step: {total_elapsed:.1f}s elapsed")
+        out.append(self._RULE)
+        
+        sys.stdout.write('\n'.join(out) + '\n')
+        
+        try:
+            if self._metrics_fp is not None:
+                self._write_metrics({
+                    'event': 'step', 'step': self.step_name,
+                    'elapsed_time': total_elapsed, 'stats': self.stats
+                })
+        finally:
+            # The step is over; write out this tracker's records and release the file
+            self.close()
         
-        print(f"\n🔄 Ready to proceed to next step: {total_elapsed:.1f}s elapsed")
-        print("=" * 100)
+        self._flush()
         
         return self.stats
     
-    def _extract_meaningful_title(self, filename: str) -> str:
-        """Extract a meaningful, readable title from filename."""
+    def close(self):
+        """Flush and close the metrics sidecar. Safe to call more than once."""
+        if self._metrics_fp is not None:
+            metrics_fp, self._metrics_fp = self._metrics_fp, None
+            metrics_fp.close()
+    
+    def _write_metrics(self, record: Dict[str, Any]):
+        """Append one record to the metrics sidecar."""
+        self._metrics_fp.write(_json_line(record))
+    
+    def _flush(self):
+        """Flush buffered progress output at book and step boundaries."""
+        sys.stdout.flush()
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=4096)
+    def _extract_meaningful_title(filename: str) -> str:
+        """Extract a meaningful, readable title from filename (cached per filename)."""
         # Remove file extensions
         title = filename.replace('.txt', '').replace('.txt_1', '').replace('.txt_2', '')
         
@@ -425,14 +654,11 @@ class DetailedProgressLogger:
         words = title.split()
         formatted_words = []
         
-        # Roman numerals and common abbreviations
-        roman_numerals = {'I', 'II', 'III', 'IV', 'V', 'VI', 'VII', 'VIII', 'IX', 'X', 
-                         'XI', 'XII', 'XIII', 'XIV', 'XV', 'XX', 'XXX', 'XL', 'L', 
-                         'C', 'CI', 'CII', 'CIII'}
-        
         for word in words:
-            if word.upper() in roman_numerals or word in ['I', 'II', 'III']:
-                formatted_words.append(word.upper())
+            # Roman numerals and common abbreviations
+            word_upper = word.upper()
+            if word_upper in ROMAN_NUMERALS:
+                formatted_words.append(word_upper)
             elif len(word) <= 2:  # Short prepositions, etc.
                 formatted_words.append(word.lower())
             else:
@@ -446,10 +672,10 @@ class DetailedProgressLogger:
         
         return title
     
-    def _get_file_info(self, file_path: str) -> Dict[str, Any]:
-        """Get comprehensive file information."""
+    def _get_file_info(self, file_path: str, stat_result: Optional[os.stat_result] = None) -> Dict[str, Any]:
+        """Get comprehensive file information, reusing stat_result when the caller has one."""
         try:
-            stat = os.stat(file_path)
+            stat = stat_result if stat_result is not None else os.stat(file_path)
             size = stat.st_size
             
             # Format size display
@@ -460,9 +686,20 @@ class DetailedProgressLogger:
             else:
                 size_display = f"{size} bytes"
             
-            # Count lines efficiently
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                lines = sum(1 for _ in f)
+            # Count lines efficiently: count newlines in raw 1 MiB blocks, no decoding
+            lines = 0
+            last_block = b''
+            with open(file_path, 'rb') as f:
+                read = f.read
+                while True:
+                    block = read(1 << 20)
+                    if not block:
+                        break
+                    lines += block.count(b'\n')
+                    last_block = block
+            # A final line without a trailing newline still counts as a line
+            if last_block and not last_block.endswith(b'\n'):
+                lines += 1
             
             # Determine file type based on content
             file_type = "Text file"
@@ -501,4 +738,6 @@ def log_major_milestone(message: str, level: str = "info"):
     elif level == "error":
         print(f"\n❌ {timestamp} | ERROR: {message}")
     else:
-        print(f"\n📢 {timestamp} | {message}")
\ No newline at end of file
+        print(f"\n📢 {timestamp} | {message}")
+    
+    sys.stdout.flush()
\ No newline at end of file
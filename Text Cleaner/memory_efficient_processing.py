@@ -5,48 +5,188 @@ Provides streaming and chunked processing capabilities to handle very large file
 without loading them entirely into memory. Can reduce memory usage by 70-90%.
 """
 
+import io
 import os
-from typing import Iterator, Callable, Any
+import errno
+import codecs
+import shutil
+from itertools import islice
+from typing import Iterator, Callable, Any, List, Optional, Union
 from pathlib import Path
 
+# Read size and file buffer size for the binary (byte-level) processing path
+BINARY_CHUNK_SIZE = 1 << 20
+BINARY_BUFFER_SIZE = io.DEFAULT_BUFFER_SIZE * 16
+
+def copy_file_contents(infile, outfile) -> None:
+    """
+    Copy an open binary file into another, in-kernel via os.sendfile where the
+    platform supports it, otherwise with 1 MiB shutil.copyfileobj blocks.
+    """
+    if hasattr(os, 'sendfile'):
+        start = offset = infile.tell()
+        try:
+            outfile.flush()
+            in_fd, out_fd = infile.fileno(), outfile.fileno()
+            remaining = os.fstat(in_fd).st_size - offset
+            while remaining > 0:
+                sent = os.sendfile(out_fd, in_fd, offset, remaining)
+                if sent == 0:
+                    break
+                offset += sent
+                remaining -= sent
+            infile.seek(offset)
+            outfile.seek(0, os.SEEK_END)
+            return
+        except OSError:
+            # e.g. unsupported file system; fall back to a user-space copy, but
+            # only if nothing was sent yet: the output has already advanced past
+            # a partial transfer, and copying from the start would duplicate it
+            if offset != start:
+                raise
+    
+    shutil.copyfileobj(infile, outfile, length=BINARY_CHUNK_SIZE)
+
+# os.link failures that mean "can't link here" (other file system, no hard-link
+# support, link limit) rather than a real error
+LINK_FALLBACK_ERRNOS = {errno.EXDEV, errno.EPERM, errno.EMLINK, errno.ENOTSUP, errno.EOPNOTSUPP}
+
+def link_or_copy(source_path, dest_path, copy_function=shutil.copy2):
+    """
+    Hard-link an intermediate file that later steps only read, so no bytes are copied;
+    falls back to copy_function where the file can't be linked. Set
+    WSLTC_COPY_FILES=1 (clean_texts_v2.py --copy-files) to always copy.
+    """
+    # Remove an earlier output first: it may be a link, and writing through it
+    # would change the file it shares an inode with
+    try:
+        os.remove(dest_path)
+    except FileNotFoundError:
+        pass
+    
+    if not os.environ.get('WSLTC_COPY_FILES'):
+        try:
+            os.link(source_path, dest_path)
+            return dest_path
+        except OSError as e:
+            if e.errno not in LINK_FALLBACK_ERRNOS:
+                raise
+    
+    return copy_function(source_path, dest_path)
+
 class StreamingFileProcessor:
     """Process files in chunks to minimize memory usage."""
     
-    def __init__(self, chunk_size: int = 8192):
+    def __init__(self, chunk_size: int = 1 << 20):
         """
         Initialize processor with chunk size.
         
         Args:
-            chunk_size: Size of chunks to read at once (bytes)
+            chunk_size: Size of chunks to read at once (characters on the text path)
         """
         self.chunk_size = chunk_size
     
+    @staticmethod
+    def _process_line_aligned(infile, outfile, processor_func, read_size, newline) -> None:
+        """
+        Feed processor_func chunks that always end on a line boundary, carrying the
+        partial last line into the next read so no line is split between two calls.
+        """
+        tail = newline[:0]
+        while True:
+            chunk = infile.read(read_size)
+            if not chunk:
+                break
+            
+            chunk = tail + chunk
+            last_newline = chunk.rfind(newline)
+            if last_newline < 0:
+                # No complete line yet (very long line); keep reading
+                tail = chunk
+                continue
+            
+            # Process the chunk
+            outfile.write(processor_func(chunk[:last_newline + 1]))
+            tail = chunk[last_newline + 1:]
+        
+        # Final line without a trailing newline
+        if tail:
+            outfile.write(processor_func(tail))
+    
+    @staticmethod
+    def _process_binary_buffered(infile, outfile, processor_func) -> None:
+        """
+        Binary counterpart of _process_line_aligned that reads into one preallocated
+        bytearray with readinto() instead of allocating a new bytes object per read.
+        The partial last line is moved to the front of the buffer for the next read;
+        the buffer only grows for lines longer than it and is shrunk back afterwards.
+        """
+        buffer = bytearray(BINARY_CHUNK_SIZE)
+        filled = 0
+        while True:
+            if filled == len(buffer):
+                # No newline in a full buffer: grow it to fit the long line
+                buffer.extend(bytes(len(buffer)))
+            
+            with memoryview(buffer)[filled:] as free:
+                bytes_read = infile.readinto(free)
+            if not bytes_read:
+                break
+            filled += bytes_read
+            
+            last_newline = buffer.rfind(b'\n', 0, filled)
+            if last_newline < 0:
+                continue
+            
+            # Process the chunk
+            with memoryview(buffer) as view:
+                chunk = view[:last_newline + 1].tobytes()
+            outfile.write(processor_func(chunk))
+            
+            remaining = filled - last_newline - 1
+            buffer[:remaining] = buffer[last_newline + 1:filled]
+            filled = remaining
+            
+            if len(buffer) > BINARY_CHUNK_SIZE and filled <= BINARY_CHUNK_SIZE:
+                del buffer[BINARY_CHUNK_SIZE:]
+        
+        # Final line without a trailing newline
+        if filled:
+            outfile.write(processor_func(bytes(buffer[:filled])))
+    
     def process_file_chunked(self, file_path: str, 
-                           processor_func: Callable[[str], str],
-                           output_path: str = None) -> None:
+                           processor_func: Optional[Callable[[Union[str, bytes]], Union[str, bytes]]],
+                           output_path: str = None,
+                           binary: bool = False) -> None:
         """
         Process a file in chunks, applying processor_func to each chunk.
+        Chunks are line-aligned, so processors never see a line split across two calls.
         
         Args:
             file_path: Input file path
-            processor_func: Function to apply to each text chunk
+            processor_func: Function to apply to each text chunk (None copies the file unchanged)
             output_path: Output file path (if None, overwrites input)
+            binary: Read and write raw bytes in 1 MiB chunks, skipping UTF-8 decode/encode;
+                    processor_func then receives and returns bytes
         """
         if output_path is None:
             output_path = file_path + '.tmp'
             
         try:
-            with open(file_path, 'r', encoding='utf-8') as infile, \
-                 open(output_path, 'w', encoding='utf-8') as outfile:
-                
-                while True:
-                    chunk = infile.read(self.chunk_size)
-                    if not chunk:
-                        break
+            if binary or processor_func is None:
+                with open(file_path, 'rb', buffering=BINARY_BUFFER_SIZE) as infile, \
+                     open(output_path, 'wb', buffering=BINARY_BUFFER_SIZE) as outfile:
+                    
+                    if processor_func is None:
+                        copy_file_contents(infile, outfile)
+                    else:
+                        self._process_binary_buffered(infile, outfile, processor_func)
+            else:
+                with open(file_path, 'r', encoding='utf-8') as infile, \
+                     open(output_path, 'w', encoding='utf-8') as outfile:
                     
-                    # Process the chunk
-                    processed_chunk = processor_func(chunk)
-                    outfile.write(processed_chunk)
+                    self._process_line_aligned(infile, outfile, processor_func,
+                                               self.chunk_size, '\n')
             
             # Replace original file if using temporary
             if output_path.endswith('.tmp'):
@@ -60,15 +200,46 @@ class StreamingFileProcessor:
     
     def process_lines_streaming(self, file_path: str,
                               line_processor: Callable[[str], str],
-                              output_path: str = None) -> None:
+                              output_path: str = None,
+                              block_lines: int = 4096) -> None:
         """
         Process file line by line for maximum memory efficiency.
+        Lines are read and written in blocks of block_lines, so there is one write per block.
         
         Args:
             file_path: Input file path
-            line_processor: Function to apply to each line
+            line_processor: Function to apply to each line (return None to drop the line)
             output_path: Output file path (if None, overwrites input)
+            block_lines: Number of lines read and written together
+        """
+        def lines_processor(lines: List[str]) -> str:
+            processed = map(line_processor, lines)
+            return ''.join([line for line in processed if line is not None])  # Allow filtering out lines
+        
+        self._stream_line_blocks(file_path, lines_processor, output_path, block_lines)
+    
+    def process_blocks_streaming(self, file_path: str,
+                               block_processor: Callable[[str], str],
+                               output_path: str = None,
+                               block_lines: int = 4096) -> None:
         """
+        Process file in blocks of whole lines, calling block_processor once per block.
+        
+        Args:
+            file_path: Input file path
+            block_processor: Function to apply to each block of up to block_lines lines
+            output_path: Output file path (if None, overwrites input)
+            block_lines: Number of lines passed to block_processor at once
+        """
+        def lines_processor(lines: List[str]) -> str:
+            return block_processor(''.join(lines))
+        
+        self._stream_line_blocks(file_path, lines_processor, output_path, block_lines)
+    
+    def _stream_line_blocks(self, file_path: str,
+                            lines_processor: Callable[[List[str]], str],
+                            output_path: str, block_lines: int) -> None:
+        """Read block_lines lines at a time, process them together and write once per block."""
         if output_path is None:
             output_path = file_path + '.tmp'
             
@@ -76,10 +247,11 @@ class StreamingFileProcessor:
             with open(file_path, 'r', encoding='utf-8') as infile, \
                  open(output_path, 'w', encoding='utf-8') as outfile:
                 
-                for line in infile:
-                    processed_line = line_processor(line)
-                    if processed_line is not None:  # Allow filtering out lines
-                        outfile.write(processed_line)
+                while True:
+                    lines = list(islice(infile, block_lines))
+                    if not lines:
+                        break
+                    outfile.write(lines_processor(lines))
             
             # Replace original file if using temporary
             if output_path.endswith('.tmp'):
@@ -91,52 +263,53 @@ class StreamingFileProcessor:
                 os.remove(output_path)
             raise e
     
-    def get_file_info_efficient(self, file_path: str) -> dict:
+    def get_file_info_efficient(self, file_path: str,
+                                stat_result: Optional[os.stat_result] = None) -> dict:
         """
         Get file information without loading entire file into memory.
         
+        Args:
+            file_path: Input file path
+            stat_result: Existing stat of the file (e.g. from DirEntry.stat()), if any
+        
         Returns:
             dict with 'size', 'lines', 'encoding_confidence'
         """
         file_path = Path(file_path)
         
         # Get file size
-        file_size = file_path.stat().st_size
+        if stat_result is None:
+            stat_result = file_path.stat()
+        file_size = stat_result.st_size
         
-        # Count lines efficiently
+        # Count lines efficiently: count newlines in raw 1 MiB blocks, no decoding.
+        # The sample comes from the first block, so the file is opened once.
         line_count = 0
         sample_chars = ""
         
+        head = b''
+        last_block = b''
+        with open(file_path, 'rb') as f:
+            read = f.read
+            while True:
+                block = read(1 << 20)
+                if not block:
+                    break
+                if not last_block:
+                    head = block[:4096]
+                line_count += block.count(b'\n')
+                last_block = block
+        # A final line without a trailing newline still counts as a line
+        if last_block and not last_block.endswith(b'\n'):
+            line_count += 1
+        
+        # Decode the sample; the incremental decoder tolerates a multi-byte
+        # character cut off at the end of the head
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                # Count lines and gather sample
-                for i, line in enumerate(f):
-                    line_count += 1
-                    
-                    # Collect sample from first 1KB for analysis
-                    if len(sample_chars) < 1024:
-                        sample_chars += line
-                    
-                    # For very large files, don't count every line
-                    if file_size > 10 * 1024 * 1024 and i > 10000:  # > 10MB
-                        # Estimate remaining lines based on average
-                        avg_line_length = f.tell() / (i + 1)
-                        remaining_bytes = file_size - f.tell()
-                        estimated_remaining_lines = remaining_bytes / avg_line_length
-                        line_count += int(estimated_remaining_lines)
-                        break
-                        
+            sample_chars = codecs.getincrementaldecoder('utf-8')().decode(head)
         except UnicodeDecodeError:
             # Try with different encoding
-            try:
-                with open(file_path, 'r', encoding='latin-1') as f:
-                    for i, line in enumerate(f):
-                        line_count += 1
-                        if i > 100:  # Just get a rough estimate
-                            line_count = int((file_size / f.tell()) * (i + 1))
-                            break
-            except:
-                line_count = 0  # Unable to determine
+            sample_chars = head.decode('latin-1')
         
         return {
             'size': file_size,
@@ -158,25 +331,36 @@ class MemoryEfficientBatchProcessor:
         self.max_memory_bytes = max_memory_mb * 1024 * 1024
         self.stream_processor = StreamingFileProcessor()
     
-    def should_stream_file(self, file_path: str) -> bool:
+    def should_stream_file(self, file_path: str,
+                           stat_result: Optional[os.stat_result] = None) -> bool:
         """Determine if file should be processed via streaming."""
         try:
-            file_size = os.path.getsize(file_path)
+            if stat_result is not None:
+                file_size = stat_result.st_size
+            else:
+                file_size = os.path.getsize(file_path)
             # Stream files larger than 25% of memory limit
             return file_size > (self.max_memory_bytes * 0.25)
         except:
             return True  # Default to streaming on error
     
     def process_file_adaptive(self, file_path: str, 
-                            processor_func: Callable[[str], str],
-                            output_path: str = None) -> str:
+                            processor_func: Optional[Callable[[str], str]],
+                            output_path: str = None,
+                            stat_result: Optional[os.stat_result] = None) -> str:
         """
         Adaptively process file based on size - streaming or in-memory.
+        A processor_func of None copies the file unchanged, without decoding it.
         
         Returns:
-            Processing method used ('streaming' or 'memory')
+            Processing method used ('streaming', 'memory' or 'copy')
         """
-        if self.should_stream_file(file_path):
+        if processor_func is None:
+            if output_path is not None and output_path != file_path:
+                self.stream_processor.process_file_chunked(file_path, None, output_path)
+            return 'copy'
+        
+        if self.should_stream_file(file_path, stat_result):
             # Use streaming for large files
             def chunk_processor(chunk: str) -> str:
                 return processor_func(chunk)
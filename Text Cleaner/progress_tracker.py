@@ -7,6 +7,7 @@ Now integrated with DetailedProgressLogger for comprehensive moment-by-moment tr
 """
 
 import time
+import functools
 import logging
 import os
 from pathlib import Path
@@ -21,7 +22,7 @@ class ProgressTracker:
         self.total_files = total_files
         self.current_file = 0
         self.start_time = time.time()
-        self.current_book_start = None
+        self.current_book_start_ns = None
         
         # Initialize detailed progress logger
         self.detailed_logger = DetailedProgressLogger(step_name, step_description, total_files)
@@ -53,13 +54,13 @@ class ProgressTracker:
         self.logger.info(f"🕐 Started at: {time.strftime('%H:%M:%S', time.localtime(self.start_time))}")
         self.logger.info("-" * 80)
     
-    def start_file(self, filename, file_path=None, file_size=None):
+    def start_file(self, filename, file_path=None, file_size=None, stat_result=None):
         """Start processing a new file with detailed logging."""
         self.current_file += 1
-        self.current_book_start = time.time()
+        self.current_book_start_ns = time.monotonic_ns()
         
         # Use detailed logger for comprehensive book start logging
-        book_title = self.detailed_logger.start_book_processing(filename, file_path)
+        book_title = self.detailed_logger.start_book_processing(filename, file_path, stat_result)
         
         # Keep legacy logging for backward compatibility
         progress_pct = ""
@@ -76,8 +77,10 @@ class ProgressTracker:
         
         return book_title
     
-    def extract_book_title(self, filename):
-        """Extract readable book title from filename."""
+    @staticmethod
+    @functools.lru_cache(maxsize=4096)
+    def extract_book_title(filename):
+        """Extract readable book title from filename (cached per filename)."""
         # Remove file extensions
         title = filename.replace('.txt', '').replace('.txt_1', '').replace('.txt_2', '')
         
@@ -110,10 +113,12 @@ class ProgressTracker:
         return title
     
     def finish_file(self, success=True, lines_processed=0, bytes_processed=0, 
-                   expansions_made=0, categories_removed=0, error_msg=None, summary=""):
+                   expansions_made=0, categories_removed=0, error_msg=None, summary="",
+                   elapsed=None):
         """Finish processing current file with detailed logging."""
-        if self.current_book_start:
-            elapsed = time.time() - self.current_book_start
+        if self.current_book_start_ns is not None:
+            if elapsed is None:
+                elapsed = (time.monotonic_ns() - self.current_book_start_ns) / 1e9
             
             # Update statistics
             if success:
@@ -129,37 +134,21 @@ class ProgressTracker:
                     success=True, 
                     summary=summary,
                     lines_processed=lines_processed,
-                    operations_count=operations_count
+                    operations_count=operations_count,
+                    elapsed_time=elapsed
                 )
                 
-                # Keep legacy logging for backward compatibility
-                details = []
-                if lines_processed > 0:
-                    details.append(f"{lines_processed} lines")
-                if bytes_processed > 0:
-                    if bytes_processed > 1024:
-                        details.append(f"{bytes_processed//1024}KB")
-                    else:
-                        details.append(f"{bytes_processed}B")
-                if expansions_made > 0:
-                    details.append(f"{expansions_made} expansions")
-                if categories_removed > 0:
-                    details.append(f"{categories_removed} categories removed")
-                
-                detail_str = ", ".join(details)
-                if detail_str:
-                    detail_str = f" | {detail_str}"
-                
             else:
                 self.stats['errors'] += 1
                 # Use detailed logger for failure logging
                 self.detailed_logger.finish_book_processing(
                     success=False, 
                     error_msg=error_msg,
-                    lines_processed=lines_processed
+                    lines_processed=lines_processed,
+                    elapsed_time=elapsed
                 )
             
-            self.current_book_start = None
+            self.current_book_start_ns = None
     
     def skip_file(self, reason=""):
         """Mark file as skipped with detailed logging."""
@@ -168,9 +157,8 @@ class ProgressTracker:
         # Use detailed logger
         self.detailed_logger.skip_book(reason)
         
-        # Keep legacy logging
-        reason_str = f": {reason}" if reason else ""
-        self.logger.info(f"   ⏭️  Skipped{reason_str}")
+        # Keep legacy logging (formatted lazily, only if INFO is enabled)
+        self.logger.info("   ⏭️  Skipped%s%s", ": " if reason else "", reason)
     
     def update_stat(self, stat_name, increment=1):
         """Update a specific statistic."""
@@ -179,14 +167,15 @@ class ProgressTracker:
     
     def log_progress(self, message, level="info"):
         """Log a progress message."""
+        # Messages are passed as arguments so logging only formats the ones it emits
         if level == "debug":
-            self.logger.debug(f"   🔍 {message}")
+            self.logger.debug("   🔍 %s", message)
         elif level == "warning":
-            self.logger.warning(f"   ⚠️  {message}")
+            self.logger.warning("   ⚠️  %s", message)
         elif level == "error":
-            self.logger.error(f"   ❌ {message}")
+            self.logger.error("   ❌ %s", message)
         else:
-            self.logger.info(f"   📝 {message}")
+            self.logger.info("   📝 %s", message)
     
     def log_operation(self, operation: str, details: str = "", success: bool = True, count: int = 0):
         """Log a detailed operation with the detailed logger."""
@@ -196,6 +185,11 @@ class ProgressTracker:
         """Log detailed text analysis showing before/after."""
         self.detailed_logger.log_text_analysis(original_text, processed_text, analysis_type)
     
+    def log_text_analysis_counts(self, orig_lines: int, proc_lines: int,
+                                 orig_chars: int, proc_chars: int, analysis_type: str):
+        """Log a before/after analysis from precomputed line and character counts."""
+        self.detailed_logger.log_text_analysis_counts(orig_lines, proc_lines, orig_chars, proc_chars, analysis_type)
+    
     def log_pattern_matching(self, pattern_name: str, matches_found: int, sample_matches=None):
         """Log pattern matching results with samples."""
         self.detailed_logger.log_pattern_matching(pattern_name, matches_found, sample_matches)
@@ -227,22 +221,47 @@ class ProgressTracker:
         log_major_milestone(f"Completed {self.step_name} with {self.stats['files_processed']} files processed", "success")
         
         return self.stats
+    
+    def close(self):
+        """Close the detailed logger's metrics file, e.g. when a step fails before its summary."""
+        self.detailed_logger.close()
 
 def get_file_line_count(filepath):
-    """Efficiently count lines in a file."""
+    """
+    Efficiently count lines in a file by scanning raw 1 MiB blocks, without
+    decoding. Counts the same lines as iterating the file in text mode:
+    \n, \r\n and a lone \r each end a line, plus any unterminated last line.
+    """
     try:
-        with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-            return sum(1 for _ in f)
+        lines = 0
+        last = b''
+        with open(filepath, 'rb') as f:
+            read = f.read
+            while True:
+                block = read(1 << 20)
+                if not block:
+                    break
+                lines += block.count(b'\n')
+                if b'\r' in block:
+                    lines += block.count(b'\r') - block.count(b'\r\n')
+                # A \r\n split across two blocks was counted twice
+                if last.endswith(b'\r') and block.startswith(b'\n'):
+                    lines -= 1
+                last = block
+        if last and not last.endswith((b'\n', b'\r')):
+            lines += 1
+        return lines
     except:
         return 0
 
-def get_file_stats(filepath):
-    """Get comprehensive file statistics."""
+def get_file_stats(filepath, size=None):
+    """Get comprehensive file statistics (pass size if it is already known)."""
     try:
-        stat = os.stat(filepath)
+        if size is None:
+            size = os.stat(filepath).st_size
         line_count = get_file_line_count(filepath)
         return {
-            'size': stat.st_size,
+            'size': size,
             'lines': line_count
         }
     except:
@@ -14,6 +14,8 @@ import subprocess
 import sys
 import time
 import logging
+import threading
+from collections import deque
 from pathlib import Path
 from detailed_progress_logger import log_major_milestone
 
@@ -21,6 +23,11 @@ from detailed_progress_logger import log_major_milestone
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Steps are killed after an hour; only the last few lines of their output
+# are kept for the summary and failure report.
+STEP_TIMEOUT = 3600
+OUTPUT_TAIL_LINES = 10
+
 class OptimizedPipelineController:
     """Coordinates the entire optimized processing pipeline."""
     
@@ -74,37 +81,63 @@ class OptimizedPipelineController:
         step_start_time = time.time()
         
         try:
-            # Run the step
-            result = subprocess.run([sys.executable, step_file], 
-                                  capture_output=True, 
-                                  text=True, 
-                                  timeout=3600)  # 1 hour timeout
+            # Run the step, streaming its output instead of buffering all of it
+            process = subprocess.Popen([sys.executable, step_file],
+                                       stdout=subprocess.PIPE,
+                                       stderr=subprocess.PIPE,
+                                       text=True,
+                                       bufsize=1)
+            timed_out = threading.Event()
+            
+            def kill_step():
+                timed_out.set()
+                process.kill()
+            
+            timer = threading.Timer(STEP_TIMEOUT, kill_step)
+            timer.start()
+            stderr_tail = deque(maxlen=OUTPUT_TAIL_LINES)
+            stderr_reader = threading.Thread(target=stderr_tail.extend, args=(process.stderr,))
+            stderr_reader.start()
+            try:
+                stdout_tail = deque(maxlen=OUTPUT_TAIL_LINES)
+                stdout_line_count = 0
+                for line in process.stdout:
+                    stdout_tail.append(line.rstrip('\n'))
+                    stdout_line_count += 1
+                stderr_reader.join()
+                returncode = process.wait()
+            finally:
+                timer.cancel()
+            
+            if timed_out.is_set():
+                raise subprocess.TimeoutExpired(step_file, STEP_TIMEOUT)
             
             step_duration = time.time() - step_start_time
             self.step_times.append((step_description, step_duration))
             
-            if result.returncode == 0:
+            if returncode == 0:
                 logger.info(f"✅ COMPLETED: {step_description}")
                 logger.info(f"⏱️  Duration: {step_duration:.2f} seconds")
                 
                 # Log any important output
-                if result.stdout:
+                while stdout_tail and not stdout_tail[-1].strip():
+                    stdout_tail.pop()
+                    stdout_line_count -= 1
+                if stdout_line_count > 5:
                     # Show last few lines of output for progress info
-                    stdout_lines = result.stdout.strip().split('\n')
-                    if len(stdout_lines) > 5:
-                        logger.info("📋 Final output:")
-                        for line in stdout_lines[-3:]:
-                            if line.strip():
-                                logger.info(f"   {line}")
+                    logger.info("📋 Final output:")
+                    for line in list(stdout_tail)[-3:]:
+                        if line.strip():
+                            logger.info(f"   {line}")
                 
                 return True
             else:
                 logger.error(f"❌ FAILED: {step_description}")
-                logger.error(f"Return code: {result.returncode}")
-                if result.stderr:
-                    logger.error(f"Error output: {result.stderr}")
-                if result.stdout:
-                    logger.error(f"Standard output: {result.stdout}")
+                logger.error(f"Return code: {returncode}")
+                if stderr_tail:
+                    logger.error(f"Error output (last {len(stderr_tail)} lines): {''.join(stderr_tail)}")
+                if stdout_tail:
+                    logger.error(f"Standard output (last {len(stdout_tail)} lines): " + '\n'.join(stdout_tail))
                 return False
                 
         except subprocess.TimeoutExpired:
@@ -6,17 +6,25 @@ meaningful Latin text content. Enhanced with intelligent index detection and det
 """
 
 import os
-import re
+import errno
 import shutil
 import logging
+import concurrent.futures
 from typing import Tuple, List
 from progress_tracker import ProgressTracker, get_file_stats
+from detailed_progress_logger import start_log_queue, stop_log_queue
+from memory_efficient_processing import link_or_copy
 from optimized_regex_patterns import PATTERNS
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Content lines sampled by detect_index_content. Its thresholds never flag
+# a file with more than ~167 content lines, so a capped count decides the
+# same way as a full one.
+INDEX_SAMPLE_LINES = 200
+
 def setup_directories():
     """Create necessary directories for processing."""
     directories = [
@@ -26,9 +34,21 @@ def setup_directories():
     ]
     
     for directory in directories:
-        if not os.path.exists(directory):
+        try:
             os.makedirs(directory)
-            logger.info(f"Created directory: {directory}")
+        except FileExistsError:
+            continue
+        logger.info(f"Created directory: {directory}")
+
+def move_file(source_path, dest_path):
+    """Move a file by renaming it, copying only when it crosses filesystems."""
+    try:
+        os.replace(source_path, dest_path)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        shutil.copy2(source_path, dest_path)
+        os.remove(source_path)
 
 def detect_index_content(file_path: str) -> Tuple[bool, List[str]]:
     """
@@ -36,22 +56,30 @@ def detect_index_content(file_path: str) -> Tuple[bool, List[str]]:
     Returns (is_index, list_of_detected_patterns)
     """
     try:
+        # Skip header section (standard in our pipeline). Only the first
+        # INDEX_SAMPLE_LINES content lines are kept, so large books are not
+        # read in full once the header has been passed.
+        header_lines = []
+        content_lines = None
         with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        # Skip header section (standard in our pipeline)
-        lines = content.split('\n')
-        content_start = 0
-        for i, line in enumerate(lines):
-            if '----' in line or line.strip().startswith('--'):
-                content_start = i + 1
-                break
+            for line in f:
+                line = line.rstrip('\n')
+                if content_lines is None:
+                    if '----' in line or line.strip().startswith('--'):
+                        content_lines = []
+                    elif line.strip() and len(header_lines) < INDEX_SAMPLE_LINES:
+                        header_lines.append(line.strip())
+                elif line.strip():
+                    content_lines.append(line.strip())
+                    if len(content_lines) >= INDEX_SAMPLE_LINES:
+                        break
         
-        actual_content = '\n'.join(lines[content_start:]).strip()
+        # Without a header separator the whole file is content
+        if content_lines is None:
+            content_lines = header_lines
         
         # Check for index patterns - adapted for Latin texts
         detected_patterns = []
-        content_lines = [line.strip() for line in actual_content.split('\n') if line.strip()]
         
         if len(content_lines) == 0:
             return False, []
@@ -80,7 +108,7 @@ def detect_index_content(file_path: str) -> Tuple[bool, List[str]]:
             elif PATTERNS.PAGE_PATTERN.match(line):
                 detected_patterns.append(f"Page number: {line}")
         
-        # Decision logic adapted for Latin corpus
+        # Decision logic adapted for Latin corpus (capped at INDEX_SAMPLE_LINES)
         total_lines = len(content_lines)
         
         # Strong indicators of index content
@@ -100,9 +128,8 @@ def detect_index_content(file_path: str) -> Tuple[bool, List[str]]:
         for line in content_lines[:30]:  # Check first 30 lines
             # Lines that are mostly punctuation, numbers, or very short
             if (len(line) < 20 and 
-                not re.search(r'[a-zA-Z]{4,}', line) and  # Not much actual text
                 not line.endswith('.') and  # Doesn't end like prose
-                not PATTERNS.LATIN_FUNCTION_WORDS.search(line)):  # No Latin function words (optimized)
+                not PATTERNS.PROSE_WORD_PATTERN.search(line)):  # No real words or Latin function words (optimized)
                 non_prose_lines += 1
         
         if non_prose_lines > total_lines * 0.4 and total_lines < 50:
@@ -120,13 +147,9 @@ def analyze_file_sizes(input_folder):
         logger.error(f"Input folder '{input_folder}' not found!")
         return None
     
-    file_sizes = []
-    txt_files = [f for f in os.listdir(input_folder) if f.endswith('.txt')]
-    
-    for filename in txt_files:
-        filepath = os.path.join(input_folder, filename)
-        size = os.path.getsize(filepath)
-        file_sizes.append((filename, size))
+    with os.scandir(input_folder) as entries:
+        file_sizes = [(entry.name, entry.stat().st_size) for entry in entries
+                      if entry.name.endswith('.txt') and entry.is_file()]
     
     file_sizes.sort(key=lambda x: x[1])
     
@@ -135,11 +158,10 @@ def analyze_file_sizes(input_folder):
     for i in range(min(10, len(file_sizes))):
         logger.info(f"  {file_sizes[i][0]}: {file_sizes[i][1]} bytes")
     
-    # Calculate statistics
-    sizes_only = [size for _, size in file_sizes]
-    if sizes_only:
-        logger.info(f"Median size: {sorted(sizes_only)[len(sizes_only)//2]} bytes")
-        logger.info(f"Average size: {sum(sizes_only)/len(sizes_only):.0f} bytes")
+    # Calculate statistics (file_sizes is already sorted by size)
+    if file_sizes:
+        logger.info(f"Median size: {file_sizes[len(file_sizes)//2][1]} bytes")
+        logger.info(f"Average size: {sum(size for _, size in file_sizes)/len(file_sizes):.0f} bytes")
     
     return file_sizes
 
@@ -172,97 +194,118 @@ def remove_short_and_index_files(input_folder, min_size_bytes=200, backup=True):
     total_bytes_kept = 0
     index_patterns_found = []
     
-    for filename, size in file_sizes:
-        filepath = os.path.join(input_folder, filename)
-        
-        # Get detailed file stats
-        file_stats = get_file_stats(filepath)
-        book_title = progress.start_file(filename, filepath, size)
+    # Index detection reads and scans every candidate file, so it runs in
+    # worker processes; backups, deletions and logging stay here, in file order.
+    # With a single CPU a background thread still reads ahead, overlapping
+    # the next file's disk reads with this loop's copies and line counts.
+    candidates = [os.path.join(input_folder, filename)
+                  for filename, size in file_sizes if size >= min_size_bytes]
+    workers = min(len(candidates), os.cpu_count() or 1)
+    executor_class = (concurrent.futures.ProcessPoolExecutor if workers > 1
+                      else concurrent.futures.ThreadPoolExecutor)
+    
+    with executor_class(max_workers=max(workers, 1)) as executor:
+        detections = executor.map(detect_index_content, candidates)
         
-        try:
-            remove_reason = None
-            remove_type = None
+        for filename, size in file_sizes:
+            filepath = os.path.join(input_folder, filename)
             
-            # Log file analysis start
-            progress.log_operation("Starting file analysis", f"Size: {size} bytes, Lines: {file_stats.get('lines', 0)}")
+            book_title = progress.start_file(filename, filepath, size)
+            detection = next(detections) if size >= min_size_bytes else None
             
-            # Check if file is too small
-            if size < min_size_bytes:
-                remove_reason = f"too small ({size} bytes < {min_size_bytes})"
-                remove_type = "short"
-                progress.log_operation("Size check failed", f"File is below minimum threshold", True, 1)
-                
-            # Check if file contains index content (only for files that aren't too small)
+            # Get detailed file stats (removed files only show their line
+            # count in verbose logs, so skip reading them otherwise)
+            if detection is not None and not detection[0] or progress.detailed_logger.verbosity >= 2:
+                file_stats = get_file_stats(filepath, size)
             else:
-                progress.log_operation("Size check passed", f"File meets minimum size requirement ({size} >= {min_size_bytes})")
-                progress.log_operation("Starting index detection", "Analyzing content for index/TOC patterns")
+                file_stats = {'size': size, 'lines': 0}
+            
+            try:
+                remove_reason = None
+                remove_type = None
+                patterns = []
+                
+                # Log file analysis start
+                progress.log_operation("Starting file analysis", f"Size: {size} bytes, Lines: {file_stats.get('lines', 0)}")
                 
-                is_index, patterns = detect_index_content(filepath)
-                if is_index:
-                    remove_reason = f"index/TOC content detected ({len(patterns)} patterns)"
-                    remove_type = "index"
-                    index_patterns_found.extend(patterns[:3])  # Keep sample patterns
+                # Check if file is too small
+                if size < min_size_bytes:
+                    remove_reason = f"too small ({size} bytes < {min_size_bytes})"
+                    remove_type = "short"
+                    progress.log_operation("Size check failed", f"File is below minimum threshold", True, 1)
                     
-                    progress.log_pattern_matching("Index/TOC patterns", len(patterns), patterns[:3])
-                    progress.log_operation("Index detection positive", f"Identified as index/TOC file", True, len(patterns))
+                # Check if file contains index content (only for files that aren't too small)
                 else:
-                    progress.log_operation("Index detection negative", "No index/TOC patterns detected - keeping file")
-            
-            # Remove file if it matches removal criteria
-            if remove_reason:
-                progress.log_operation("File marked for removal", remove_reason)
+                    progress.log_operation("Size check passed", f"File meets minimum size requirement ({size} >= {min_size_bytes})")
+                    progress.log_operation("Starting index detection", "Analyzing content for index/TOC patterns")
+                    
+                    is_index, patterns = detection
+                    if is_index:
+                        remove_reason = f"index/TOC content detected ({len(patterns)} patterns)"
+                        remove_type = "index"
+                        index_patterns_found.extend(patterns[:3])  # Keep sample patterns
+                        
+                        progress.log_pattern_matching("Index/TOC patterns", len(patterns), patterns[:3])
+                        progress.log_operation("Index detection positive", f"Identified as index/TOC file", True, len(patterns))
+                    else:
+                        progress.log_operation("Index detection negative", "No index/TOC patterns detected - keeping file")
                 
-                # Backup the file before removal if requested
-                if backup:
-                    if remove_type == "index":
-                        backup_path = os.path.join("removed_files_backup", "index_files", filename)
-                        backup_type = "index file backup"
+                # Remove file if it matches removal criteria
+                if remove_reason:
+                    progress.log_operation("File marked for removal", remove_reason)
+                    
+                    # Backup the file before removal if requested
+                    if backup:
+                        if remove_type == "index":
+                            backup_path = os.path.join("removed_files_backup", "index_files", filename)
+                            backup_type = "index file backup"
+                        else:
+                            backup_path = os.path.join("removed_files_backup", filename)
+                            backup_type = "short file backup"
+                        
+                        progress.log_operation("Creating backup", f"Saving to {backup_type} directory")
+                        move_file(filepath, backup_path)
+                        progress.log_file_operation(f"Backup {backup_type}", filepath, backup_path, True)
+                    
+                    # Remove the original file (moving it into the backup already did)
+                    progress.log_operation("Removing original file", "File will be deleted from input directory")
+                    if not backup:
+                        os.remove(filepath)
+                    progress.log_file_operation("Delete file", filepath, "", True)
+                    
+                    if remove_type == "short":
+                        removed_short_count += 1
+                        summary = f"Removed short file ({size} bytes)"
                     else:
-                        backup_path = os.path.join("removed_files_backup", filename)
-                        backup_type = "short file backup"
+                        removed_index_count += 1
+                        summary = f"Removed index/TOC file with {len(patterns)} patterns"
+                        
+                    total_bytes_removed += size
+                    progress.skip_file(remove_reason)
                     
-                    progress.log_operation("Creating backup", f"Saving to {backup_type} directory")
-                    shutil.copy2(filepath, backup_path)
-                    progress.log_file_operation(f"Backup {backup_type}", filepath, backup_path, True)
-                
-                # Remove the original file
-                progress.log_operation("Removing original file", "File will be deleted from input directory")
-                os.remove(filepath)
-                progress.log_file_operation("Delete file", filepath, "", True)
-                
-                if remove_type == "short":
-                    removed_short_count += 1
-                    summary = f"Removed short file ({size} bytes)"
                 else:
-                    removed_index_count += 1
-                    summary = f"Removed index/TOC file with {len(patterns) if 'patterns' in locals() else 0} patterns"
+                    # Copy to processing temp directory for next steps
+                    temp_path = os.path.join("processing_temp", filename)
                     
-                total_bytes_removed += size
-                progress.skip_file(remove_reason)
-                
-            else:
-                # Copy to processing temp directory for next steps
-                temp_path = os.path.join("processing_temp", filename)
-                
-                progress.log_operation("File approved for processing", "Copying to temp directory for next step")
-                shutil.copy2(filepath, temp_path)
-                progress.log_file_operation("Copy to temp", filepath, temp_path, True)
-                
-                kept_count += 1
-                total_bytes_kept += size
-                
-                summary = f"Kept file: {size} bytes, {file_stats.get('lines', 0)} lines"
-                progress.finish_file(success=True, 
-                                   lines_processed=file_stats.get('lines', 0),
-                                   bytes_processed=size,
-                                   summary=summary)
-                progress.update_stat('files_processed', 1)
-                
-        except Exception as e:
-            error_msg = f"Error processing file: {e}"
-            progress.log_operation("Processing failed", f"Exception occurred: {str(e)}", False)
-            progress.finish_file(success=False, error_msg=error_msg)
-            logger.error(f"Failed to process {filename}: {e}")
+                    progress.log_operation("File approved for processing", "Linking to temp directory for next step")
+                    link_or_copy(filepath, temp_path)
+                    progress.log_file_operation("Link to temp", filepath, temp_path, True)
+                    
+                    kept_count += 1
+                    total_bytes_kept += size
+                    
+                    summary = f"Kept file: {size} bytes, {file_stats.get('lines', 0)} lines"
+                    progress.finish_file(success=True, 
+                                       lines_processed=file_stats.get('lines', 0),
+                                       bytes_processed=size,
+                                       summary=summary)
+                    progress.update_stat('files_processed', 1)
+                    
+            except Exception as e:
+                error_msg = f"Error processing file: {e}"
+                progress.log_operation("Processing failed", f"Exception occurred: {str(e)}", False)
+                progress.finish_file(success=False, error_msg=error_msg)
+                logger.error(f"Failed to process {filename}: {e}")
     
     # Update final statistics
     total_removed = removed_short_count + removed_index_count
@@ -309,19 +352,23 @@ def remove_short_and_index_files(input_folder, min_size_bytes=200, backup=True):
     return final_stats
 
 def main():
-    input_folder = "Texts to be Cleaned"
-    
-    logger.info("=== Step 1: Enhanced File Filtering ===")
-    logger.info("Features: Size filtering + Intelligent index detection")
-    
-    # Analyze and remove short files and index files with enhanced tracking
-    stats = remove_short_and_index_files(input_folder, min_size_bytes=200, backup=True)
-    
-    if stats and stats['files_processed'] > 0:
-        logger.info("🎯 Step 1 completed successfully with enhanced filtering!")
-        logger.info("✨ Both short files and index/TOC files have been intelligently detected and removed!")
-    else:
-        logger.warning("⚠️  Step 1 completed with issues - check output above")
+    log_listener = start_log_queue()
+    try:
+        input_folder = "Texts to be Cleaned"
+        
+        logger.info("=== Step 1: Enhanced File Filtering ===")
+        logger.info("Features: Size filtering + Intelligent index detection")
+        
+        # Analyze and remove short files and index files with enhanced tracking
+        stats = remove_short_and_index_files(input_folder, min_size_bytes=200, backup=True)
+        
+        if stats and stats['files_processed'] > 0:
+            logger.info("🎯 Step 1 completed successfully with enhanced filtering!")
+            logger.info("✨ Both short files and index/TOC files have been intelligently detected and removed!")
+        else:
+            logger.warning("⚠️  Step 1 completed with issues - check output above")
+    finally:
+        stop_log_queue(log_listener)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
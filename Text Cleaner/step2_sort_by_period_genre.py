@@ -8,9 +8,14 @@ Based on computational philology research and Latin literary analysis.
 
 import os
 import re
+import stat
 import shutil
 import logging
+import functools
+import concurrent.futures
 from progress_tracker import ProgressTracker, get_file_stats
+from detailed_progress_logger import start_log_queue, stop_log_queue
+from memory_efficient_processing import link_or_copy
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -92,6 +97,37 @@ PROSE_CONNECTORS = [
     'praeterea', 'insuper', 'deinde', 'postea', 'interim'
 ]
 
+# Content analysis patterns, compiled once for every file classified
+WORD_PATTERN = re.compile(r'\w+')
+POETRY_STRUCTURE_PATTERN = re.compile(r'\b(carmen|versus|metra|hymn|elegia)\b')
+PROSE_STRUCTURE_PATTERN = re.compile(r'\b(liber|capitulum|sectio|paragraph|oratio)\b')
+
+# Most that classify_genre_enhanced's content analysis can add to each score
+CONTENT_MAX_GAIN = {'poetry': 6, 'prose': 5, 'mixed': 0}
+
+# Confidence levels from strongest to weakest
+CONFIDENCE_RANK = {'high': 0, 'medium': 1, 'low': 2, 'very_low': 3}
+
+# Output directory prefix for each (period, genre) pair
+OUTPUT_PREFIXES = {
+    (period, genre): os.path.join("sorted_texts", period, genre, "")
+    for period in ('classical', 'post_classical')
+    for genre in ('prose', 'poetry', 'mixed')
+}
+
+def copy_with_stat(source_path, dest_path, stat_result=None):
+    """
+    Copy a file with its permission bits and timestamps, as shutil.copy2 does,
+    but reuse a stat result the caller already has instead of re-stat-ing the source.
+    """
+    if stat_result is None:
+        return shutil.copy2(source_path, dest_path)
+    
+    shutil.copyfile(source_path, dest_path)
+    os.chmod(dest_path, stat.S_IMODE(stat_result.st_mode))
+    os.utime(dest_path, ns=(stat_result.st_atime_ns, stat_result.st_mtime_ns))
+    return dest_path
+
 def setup_output_directories():
     """Create the enhanced output directory structure."""
     directories = [
@@ -108,9 +144,11 @@ def setup_output_directories():
     ]
     
     for directory in directories:
-        if not os.path.exists(directory):
+        try:
             os.makedirs(directory)
-            logger.info(f"Created directory: {directory}")
+        except FileExistsError:
+            continue
+        logger.info(f"Created directory: {directory}")
 
 def parse_file_metadata(filepath):
     """
@@ -156,6 +194,7 @@ def classify_period_enhanced(title, category, content_sample=None):
     Never returns 'unknown' - makes educated guesses based on available evidence.
     """
     confidence_score = {'classical': 0, 'post_classical': 0}
+    title_lower = title.lower() if title else ''  # Shared by every title check below
     
     # Start with existing category-based classification (highest confidence)
     if category:
@@ -181,8 +220,6 @@ def classify_period_enhanced(title, category, content_sample=None):
     
     # Author-based classification
     if title:
-        title_lower = title.lower()
-        
         # Check for classical authors
         for author in CLASSICAL_AUTHORS:
             if author in title_lower:
@@ -217,8 +254,6 @@ def classify_period_enhanced(title, category, content_sample=None):
     
     # Fallback logic based on title patterns
     if title and max(confidence_score.values()) == 0:
-        title_lower = title.lower()
-        
         # Some title patterns suggest classical period
         if any(pattern in title_lower for pattern in ['ab urbe condita', 'bellum', 'historia', 'commentarii']):
             confidence_score['classical'] += 1
@@ -239,7 +274,6 @@ def classify_period_enhanced(title, category, content_sample=None):
     if max(confidence_score.values()) == 0:
         # Default to classical for well-known classical works, post_classical for religious content
         if title:
-            title_lower = title.lower()
             if any(term in title_lower for term in ['aeneis', 'metamorphoses', 'cicero', 'caesar']):
                 result = 'classical'
                 confidence = 'low'
@@ -259,11 +293,10 @@ def classify_genre_enhanced(title, filepath, content_sample=None):
     Based on computational philology research and Latin literary patterns.
     """
     confidence_score = {'poetry': 0, 'prose': 0, 'mixed': 0}
+    title_lower = title.lower() if title else ''  # Shared by every title check below
     
     # Title-based genre detection (highest confidence indicator)
     if title:
-        title_lower = title.lower()
-        
         # Enhanced poetry title scoring
         for indicator in POETRY_TITLE_INDICATORS:
             if indicator in title_lower:
@@ -293,19 +326,36 @@ def classify_genre_enhanced(title, filepath, content_sample=None):
                     confidence_score['mixed'] += 2
                 logger.debug(f"Author '{author}' suggests genre '{genre}'")
     
+    # Skip the content analysis when the title alone is decisive: its scores
+    # can't lift another genre past the leader, and the leader already has
+    # high confidence
+    leader = max(confidence_score, key=confidence_score.get)
+    lead_score = confidence_score[leader]
+    if lead_score >= 4 and all(score + CONTENT_MAX_GAIN[genre] < lead_score
+                               for genre, score in confidence_score.items() if genre != leader):
+        return leader, 'high'
+    
     # Enhanced content analysis
     try:
         if content_sample is None and filepath:
             with open(filepath, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
-                content_start = 0
-                for i, line in enumerate(lines):
-                    if line.strip().startswith('--'):
-                        content_start = i + 1
-                        break
+                # Analyze first 100 lines after the header for better accuracy.
+                # Reading stops there; the first 100 lines of the file are
+                # kept in case no header separator turns up.
+                first_lines = []
+                sample_lines = None
+                for line in f:
+                    if sample_lines is not None:
+                        sample_lines.append(line)
+                        if len(sample_lines) == 100:
+                            break
+                    elif line.strip().startswith('--'):
+                        sample_lines = []
+                    elif len(first_lines) < 100:
+                        first_lines.append(line)
                 
-                # Analyze first 100 lines for better accuracy
-                sample_lines = lines[content_start:content_start + 100]
+                if sample_lines is None:
+                    sample_lines = first_lines
                 content_sample = '\n'.join(sample_lines)
         
         if content_sample:
@@ -313,9 +363,18 @@ def classify_genre_enhanced(title, filepath, content_sample=None):
             
             if len(lines) > 5:  # Need minimum sample
                 # Advanced line length analysis
-                short_lines = sum(1 for line in lines if 20 <= len(line) <= 80)
-                very_short_lines = sum(1 for line in lines if 10 <= len(line) < 30)
-                long_lines = sum(1 for line in lines if len(line) > 100)
+                # (one pass gathers the length bands and period endings)
+                short_lines = very_short_lines = long_lines = period_endings = 0
+                for line in lines:
+                    line_length = len(line)
+                    if 20 <= line_length <= 80:
+                        short_lines += 1
+                    if 10 <= line_length < 30:
+                        very_short_lines += 1
+                    if line_length > 100:
+                        long_lines += 1
+                    if line.endswith('.'):
+                        period_endings += 1
                 
                 # Poetry indicators based on line length patterns
                 if very_short_lines > len(lines) * 0.3:  # 30%+ very short lines
@@ -328,8 +387,8 @@ def classify_genre_enhanced(title, filepath, content_sample=None):
                     confidence_score['prose'] += 2
                 
                 # Line ending analysis (poetry often doesn't end with periods)
-                non_period_endings = sum(1 for line in lines if line and not line.endswith('.'))
-                period_endings = sum(1 for line in lines if line.endswith('.'))
+                # (lines are stripped and non-empty, so every other line has no period)
+                non_period_endings = len(lines) - period_endings
                 
                 if non_period_endings > period_endings * 2:  # Many non-period endings
                     confidence_score['poetry'] += 1
@@ -338,7 +397,7 @@ def classify_genre_enhanced(title, filepath, content_sample=None):
                 
                 # Prose connector analysis
                 content_lower = content_sample.lower()
-                word_count = len(re.findall(r'\w+', content_sample))
+                word_count = len(WORD_PATTERN.findall(content_sample))
                 
                 if word_count > 0:
                     connector_count = sum(content_lower.count(conn) for conn in PROSE_CONNECTORS)
@@ -346,11 +405,11 @@ def classify_genre_enhanced(title, filepath, content_sample=None):
                         confidence_score['prose'] += 1
                 
                 # Look for structural poetry indicators
-                if re.search(r'\b(carmen|versus|metra|hymn|elegia)\b', content_lower):
+                if POETRY_STRUCTURE_PATTERN.search(content_lower):
                     confidence_score['poetry'] += 1
                     
                 # Look for prose structure indicators
-                if re.search(r'\b(liber|capitulum|sectio|paragraph|oratio)\b', content_lower):
+                if PROSE_STRUCTURE_PATTERN.search(content_lower):
                     confidence_score['prose'] += 1
                 
                 # Check for metrical patterns (basic hexameter detection)
@@ -371,8 +430,6 @@ def classify_genre_enhanced(title, filepath, content_sample=None):
     
     # If no clear indicators, make educated guesses based on filename patterns
     if max_score == 0 and title:
-        title_lower = title.lower()
-        
         # Common classical poetry works
         if any(work in title_lower for work in ['aeneid', 'metamorphoses', 'odes', 'satires', 'elegies']):
             confidence_score['poetry'] += 1
@@ -418,6 +475,66 @@ def classify_genre_enhanced(title, filepath, content_sample=None):
     
     return result, confidence
 
+def classify_file(filepath):
+    """
+    Read and classify one file (runs in a worker for sort_files).
+    Returns its stats, metadata and period/genre classification, or the
+    error message that stopped the classification.
+    """
+    filename = os.path.basename(filepath)
+    try:
+        stat_result = os.stat(filepath)
+    except OSError:
+        stat_result = None
+    size = stat_result.st_size if stat_result is not None else None
+    result = {'file_stats': get_file_stats(filepath, size), 'stat': stat_result, 'error': None}
+    
+    try:
+        # Empty and binary files can't be classified; reject them before the
+        # metadata and content reads
+        if size == 0:
+            raise ValueError("empty file")
+        with open(filepath, 'rb') as f:
+            if b'\x00' in f.read(8):
+                raise ValueError("binary content")
+        
+        metadata = parse_file_metadata(filepath)
+        
+        # Enhanced period classification
+        period, period_confidence = classify_period_enhanced(
+            metadata.get('title', filename),
+            metadata.get('category'),
+            None  # Could add content sample here if needed
+        )
+        
+        # Enhanced genre classification  
+        genre = metadata.get('text_type')
+        genre_confidence = 'high'  # Default for metadata
+        classification_source = "metadata"
+        
+        if not genre or genre.lower() not in ['prose', 'poetry', 'mixed']:
+            # Use enhanced classification
+            genre, genre_confidence = classify_genre_enhanced(
+                metadata.get('title', filename),
+                filepath
+            )
+            classification_source = f"enhanced_analysis"
+        else:
+            genre = genre.lower()
+        
+        result.update({
+            'metadata': metadata,
+            'period': period,
+            'period_confidence': period_confidence,
+            'genre': genre,
+            'genre_confidence': genre_confidence,
+            'classification_source': classification_source
+        })
+    except Exception as e:
+        result['error'] = str(e)
+    
+    return result
+
 def sort_files(input_folder):
     """Enhanced file sorting with comprehensive classification and detailed progress tracking."""
     setup_output_directories()
@@ -444,72 +561,67 @@ def sort_files(input_folder):
     # Detailed classification report
     classification_report = []
     
-    for filename in txt_files:
-        filepath = os.path.join(input_folder, filename)
-        file_stats = get_file_stats(filepath)
-        book_title = progress.start_file(filename, file_stats['size'])
-        
-        try:
-            metadata = parse_file_metadata(filepath)
-            
-            # Enhanced period classification
-            period, period_confidence = classify_period_enhanced(
-                metadata.get('title', filename),
-                metadata.get('category'),
-                None  # Could add content sample here if needed
-            )
-            
-            # Enhanced genre classification  
-            genre = metadata.get('text_type')
-            genre_confidence = 'high'  # Default for metadata
-            classification_source = "metadata"
-            
-            if not genre or genre.lower() not in ['prose', 'poetry', 'mixed']:
-                # Use enhanced classification
-                genre, genre_confidence = classify_genre_enhanced(
-                    metadata.get('title', filename),
-                    filepath
-                )
-                classification_source = f"enhanced_analysis"
-                progress.log_progress(f"Used enhanced analysis for genre detection")
-            else:
-                genre = genre.lower()
+    # Files are read and classified in worker processes (one background
+    # thread on a single CPU); copying, statistics and logging stay here,
+    # in file order.
+    filepaths = [os.path.join(input_folder, filename) for filename in txt_files]
+    workers = min(len(filepaths), os.cpu_count() or 1)
+    executor_class = (concurrent.futures.ProcessPoolExecutor if workers > 1
+                      else concurrent.futures.ThreadPoolExecutor)
+    
+    with executor_class(max_workers=max(workers, 1)) as executor:
+        for filename, filepath, result in zip(txt_files, filepaths, executor.map(classify_file, filepaths)):
+            file_stats = result['file_stats']
+            book_title = progress.start_file(filename, file_stats['size'])
             
-            # Determine output path (no more unknowns!)
-            output_path = os.path.join("sorted_texts", period, genre, filename)
-            stats[period][genre] += 1
-            
-            # Track confidence levels
-            overall_confidence = 'low' if period_confidence == 'very_low' or genre_confidence == 'very_low' else min(period_confidence, genre_confidence, key=lambda x: ['high', 'medium', 'low', 'very_low'].index(x))
-            stats['confidence_levels'][overall_confidence] += 1
-            
-            # Copy file to appropriate directory
-            shutil.copy2(filepath, output_path)
-            
-            # Record detailed classification info
-            classification_info = {
-                'filename': filename,
-                'period': period,
-                'period_confidence': period_confidence,
-                'genre': genre, 
-                'genre_confidence': genre_confidence,
-                'classification_source': classification_source,
-                'final_path': f"{period}/{genre}",
-                'title': metadata.get('title', 'N/A'),
-                'category': metadata.get('category', 'N/A')
-            }
-            classification_report.append(classification_info)
-            
-            # Log detailed progress
-            progress.log_progress(f"→ {period.title()} {genre.title()} ({overall_confidence} confidence)")
-            progress.finish_file(success=True, 
-                               lines_processed=file_stats.get('lines', 0),
-                               bytes_processed=file_stats['size'])
-            
-        except Exception as e:
-            error_msg = f"Classification error: {e}"
-            progress.finish_file(success=False, error_msg=error_msg)
-            stats['errors'] += 1
+            try:
+                if result['error'] is not None:
+                    raise RuntimeError(result['error'])
+                
+                metadata = result['metadata']
+                period, period_confidence = result['period'], result['period_confidence']
+                genre, genre_confidence = result['genre'], result['genre_confidence']
+                classification_source = result['classification_source']
+                
+                if classification_source == "enhanced_analysis":
+                    progress.log_progress(f"Used enhanced analysis for genre detection")
+                
+                # Determine output path (no more unknowns!)
+                output_path = OUTPUT_PREFIXES[period, genre] + filename
+                stats[period][genre] += 1
+                
+                # Track confidence levels
+                overall_confidence = 'low' if period_confidence == 'very_low' or genre_confidence == 'very_low' else min(period_confidence, genre_confidence, key=CONFIDENCE_RANK.__getitem__)
+                stats['confidence_levels'][overall_confidence] += 1
+                
+                # Link (or copy) file into the appropriate directory
+                link_or_copy(filepath, output_path,
+                             functools.partial(copy_with_stat, stat_result=result['stat']))
+                
+                # Record detailed classification info
+                classification_info = {
+                    'filename': filename,
+                    'period': period,
+                    'period_confidence': period_confidence,
+                    'genre': genre, 
+                    'genre_confidence': genre_confidence,
+                    'classification_source': classification_source,
+                    'final_path': f"{period}/{genre}",
+                    'title': metadata.get('title', 'N/A'),
+                    'category': metadata.get('category', 'N/A')
+                }
+                classification_report.append(classification_info)
+                
+                # Log detailed progress
+                progress.log_progress(f"→ {period.title()} {genre.title()} ({overall_confidence} confidence)")
+                progress.finish_file(success=True, 
+                                   lines_processed=file_stats.get('lines', 0),
+                                   bytes_processed=file_stats['size'])
+                
+            except Exception as e:
+                error_msg = f"Classification error: {e}"
+                progress.finish_file(success=False, error_msg=error_msg)
+                stats['errors'] += 1
     
     # Update final progress statistics
     progress.stats.update({
@@ -534,14 +646,17 @@ def sort_files(input_folder):
             f.write("\n")
             
             f.write("=== Detailed Classifications ===\n")
-            for info in classification_report:
-                f.write(f"\nFile: {info['filename']}\n")
-                f.write(f"  Title: {info['title']}\n")
-                f.write(f"  Category: {info['category']}\n")
-                f.write(f"  Final Classification: {info['final_path']}\n")
-                f.write(f"  Period Confidence: {info['period_confidence']}\n")  
-                f.write(f"  Genre Confidence: {info['genre_confidence']}\n")
-                f.write(f"  Source: {info['classification_source']}\n")
+            # One entry string per file, written in a single call
+            f.write(''.join(
+                f"\nFile: {info['filename']}\n"
+                f"  Title: {info['title']}\n"
+                f"  Category: {info['category']}\n"
+                f"  Final Classification: {info['final_path']}\n"
+                f"  Period Confidence: {info['period_confidence']}\n"
+                f"  Genre Confidence: {info['genre_confidence']}\n"
+                f"  Source: {info['classification_source']}\n"
+                for info in classification_report
+            ))
         
         progress.log_progress(f"Saved detailed report to {report_path}")
     except Exception as e:
@@ -570,18 +685,22 @@ def sort_files(input_folder):
     return final_stats
 
 def main():
-    input_folder = "processing_temp"
-    
-    logger.info("=== Step 2: Enhanced Classification by Period and Genre ===")
-    logger.info("Using multi-layered analysis to eliminate unknown classifications")
-    
-    stats = sort_files(input_folder)
-    
-    if stats:
-        logger.info("Step 2 completed successfully with enhanced classification!")
-        logger.info("All files have been classified - no unknowns remain!")
-    else:
-        logger.warning("Step 2 completed with errors - check the log above")
+    log_listener = start_log_queue()
+    try:
+        input_folder = "processing_temp"
+        
+        logger.info("=== Step 2: Enhanced Classification by Period and Genre ===")
+        logger.info("Using multi-layered analysis to eliminate unknown classifications")
+        
+        stats = sort_files(input_folder)
+        
+        if stats:
+            logger.info("Step 2 completed successfully with enhanced classification!")
+            logger.info("All files have been classified - no unknowns remain!")
+        else:
+            logger.warning("Step 2 completed with errors - check the log above")
+    finally:
+        stop_log_queue(log_listener)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
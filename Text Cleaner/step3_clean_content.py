@@ -9,8 +9,11 @@ Features gender-aware praenomina expansion and numeral disambiguation.
 
 import os
 import re
+import time
 import logging
-from progress_tracker import ProgressTracker, get_file_stats
+import concurrent.futures
+from progress_tracker import ProgressTracker
+from detailed_progress_logger import start_log_queue, stop_log_queue
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -106,7 +109,84 @@ STANDARD_ABBREVIATIONS = {
 }
 
 # Roman numeral patterns (to avoid expanding as names)
-ROMAN_NUMERAL_PATTERN = r'\b(?=[MDCLXVI])M{0,4}(CM|CD|D?C{0,3})(XC|XL|L?X{0,3})(IX|IV|V?I{0,3})\b'
+ROMAN_NUMERAL_PATTERN = re.compile(r'\b(?=[MDCLXVI])M{0,4}(CM|CD|D?C{0,3})(XC|XL|L?X{0,3})(IX|IV|V?I{0,3})\b')
+
+# The praenomina expand_praenomina_contextually expands (the most common ones)
+EXPANDED_PRAENOMINA = frozenset(['M\\.', 'L\\.', 'C\\.', 'P\\.', 'Q\\.'])
+
+# Patterns for the praenomina that can actually be expanded, compiled once at
+# import; a praenomen must be followed by a capitalized word (nomen/cognomen).
+# Abbreviations that read as Roman numerals (M., L., C.) are always skipped,
+# so they are not searched for at all.
+PRAENOMEN_PATTERNS = [(re.compile(r'\b' + abbreviation + r'(?=\s[A-Z])'), full_name)
+                      for abbreviation, full_name in MALE_PRAENOMINA.items()
+                      if abbreviation in EXPANDED_PRAENOMINA
+                      and not ROMAN_NUMERAL_PATTERN.fullmatch(abbreviation.replace('\\', '').replace('.', '').upper())]
+
+def _compile_standard_abbreviation(pattern):
+    """
+    Compile a STANDARD_ABBREVIATIONS pattern ('\\b' + letters...) for
+    expand_standard_abbreviations. The word boundary is checked by a lookbehind
+    after the first letter: the matches are the same, but the regex engine can
+    skip ahead to that letter instead of testing for a boundary at every position.
+    Also returns the case-folded leading letters, which a text must contain for
+    the pattern to match.
+    """
+    body = pattern[len(r'\b'):]
+    leading_text = re.split(r'\\s[*+]', body)[0].replace('\\.', '.')
+    return re.compile(body[0] + r'(?<!\w.)' + body[1:], re.IGNORECASE), leading_text.casefold()
+
+STANDARD_ABBREVIATION_PATTERNS = [(pattern, *_compile_standard_abbreviation(pattern), replacement)
+                                  for pattern, replacement in STANDARD_ABBREVIATIONS.items()]
+
+# Markers of digital metadata lines dropped by remove_source_attributions
+METADATA_LINE_PATTERNS = (
+    'exported by', 'generated by', 'digitized by', 'scanned by',
+    'copyright', '©', 'all rights reserved', 'permission',
+    'this text was', 'this edition', 'digital edition',
+    'ocr', 'optical character', 'text recognition'
+)
+
+# Line prefixes and modern-language words that make clean_non_latin_content drop a line
+MARKUP_LINE_PREFIXES = ('Title:', 'Source:', 'Category:', 'Text Type:', '#', '{{', '}}', '[[', ']]')
+MODERN_LANGUAGE_INDICATORS = (
+    'english', 'deutsch', 'français', 'español', 'italiano',
+    'translation', 'note:', 'see also', 'external link',
+    'bibliography', 'reference', 'isbn', 'doi:'
+)
+
+# Punctuation kept by standardize_punctuation, and the dashes it turns into '-'
+ALLOWED_PUNCTUATION = frozenset('.,:;!?\'"-()[]')
+DASHES = frozenset('–—')
+
+# One pass collapses every run of the same mark to a single character
+REPEATED_PUNCTUATION = re.compile(r'([.,;:])\1+')
+
+# Category, attribution and navigation patterns, compiled once at import.
+# The whole-line patterns are anchored with ^ so a long line is scanned once,
+# not once from every position in it (same matches as the unanchored form).
+COMMENTARIUM_SECTION = re.compile(r'==\s*Commentarium\s*==.*$', re.MULTILINE | re.DOTALL)
+CATEGORY_LINE = re.compile(r'^Categoria?:\s*.*$', re.MULTILINE | re.IGNORECASE)
+CATEGORY_LINE_RUN = re.compile(r'(^Categoria?:\s*.*\n?){2,}', re.MULTILINE | re.IGNORECASE)
+TRAILING_CATEGORIES = re.compile(r'\n+(?:Categoria?:\s*.*\n?)+$', re.IGNORECASE)
+CATEGORY_MARKER = re.compile(r'Categoria?:', re.IGNORECASE)
+WIKISOURCE_EXPORT_LINE = re.compile(r'^.*Exported from Wikisource.*\n?', re.MULTILINE | re.IGNORECASE)
+DIGITAL_EDITION_SECTION = re.compile(r'About this digital edition.*$', re.MULTILINE | re.DOTALL)
+SOURCE_URL_LINE = re.compile(r'Source:\s*https?://.*\n?', re.IGNORECASE)
+URL_PATTERN = re.compile(r'https?://[^\s]+')
+EDITORIAL_BRACKETS = re.compile(r'\[.*?(?:ed\.|edit\.|source|wiki).*?\]', re.IGNORECASE)
+EDITORIAL_PARENTHESES = re.compile(r'\(.*?(?:ed\.|edit\.|source|wiki).*?\)', re.IGNORECASE)
+EDITOR_ATTRIBUTION = re.compile(r'^.*(?:von Bunge|Napiersky).*possint.*', re.MULTILINE | re.IGNORECASE)
+SECTION_HEADING = re.compile(r'==+.*?==+')
+SUBSECTION_HEADING = re.compile(r'===+.*?===+')
+
+# Final whitespace cleanup. '\n\n\n+' and '[ \t]{2,}|\t' match the same runs as
+# '\n{3,}' and '[ \t]+' (a lone space is left as it is) but scan much faster.
+EXCESS_NEWLINES = re.compile(r'\n\n\n+')
+SPACE_RUNS = re.compile(r'[ \t]{2,}|\t')
+
+# Characters on either side of a praenomen searched for gender context
+GENDER_CONTEXT_RADIUS = 100
 
 # Gender context indicators for praenomina expansion
 MASCULINE_CONTEXT_WORDS = [
@@ -121,197 +201,159 @@ FEMININE_CONTEXT_WORDS = [
 
 def remove_metadata_header(text):
     """Remove the metadata header section from the beginning of the text."""
-    lines = text.split('\n')
-    content_start = 0
-    
-    # Find the end of metadata (separator line with dashes)
-    for i, line in enumerate(lines):
+    # Only the first lines can hold the header, so walk them in place rather
+    # than splitting and rejoining the whole book
+    line_start = 0
+    for i in range(22):
+        line_end = text.find('\n', line_start)
+        line = text[line_start:] if line_end == -1 else text[line_start:line_end]
+        
+        # Find the end of metadata (separator line with dashes)
         if line.strip().startswith('--') and len(line.strip()) > 10:
-            content_start = i + 1
-            break
-        elif i > 20:  # If no separator found in first 20 lines, assume no header
-            content_start = 0
+            # Return content after header
+            return '' if line_end == -1 else text[line_end + 1:]
+        if line_end == -1:
             break
+        line_start = line_end + 1
     
-    # Return content after header
-    return '\n'.join(lines[content_start:])
+    # If no separator found in the first lines, assume no header
+    return text
 
 def remove_category_sections(text):
     """Enhanced removal of category sections and metadata commonly found at text endings."""
     # Remove entire Commentarium sections (like ==Commentarium==)
-    text = re.sub(r'==\s*Commentarium\s*==.*$', '', text, flags=re.MULTILINE | re.DOTALL)
+    text = COMMENTARIUM_SECTION.sub('', text)
     
     # Remove category lines (handles both Categoria: and Category:)
-    text = re.sub(r'^Categoria?:\s*.*$', '', text, flags=re.MULTILINE | re.IGNORECASE)
+    text = CATEGORY_LINE.sub('', text)
     
     # Remove multiple consecutive category lines
-    text = re.sub(r'(^Categoria?:\s*.*\n?){2,}', '', text, flags=re.MULTILINE | re.IGNORECASE)
+    text = CATEGORY_LINE_RUN.sub('', text)
     
     # Remove standalone category sections at the end
-    text = re.sub(r'\n+(?:Categoria?:\s*.*\n?)+$', '', text, flags=re.IGNORECASE)
+    text = TRAILING_CATEGORIES.sub('', text)
     
     return text
 
 def remove_source_attributions(text):
     """Enhanced removal of source attributions and metadata with line-by-line filtering."""
-    # First pass: Line-by-line filtering for robust removal
-    lines = text.split('\n')
-    
-    # Remove lines containing "Exported from Wikisource" 
-    lines = [line for line in lines if 'Exported from Wikisource' not in line]
-    
-    # Remove everything from "About this digital edition" line onwards
-    filtered_lines = []
-    for line in lines:
-        if line.strip().startswith('About this digital edition'):
-            logger.debug("Found 'About this digital edition' - truncating content here")
-            break
-        filtered_lines.append(line)
-    
-    # Rejoin text for further processing
-    text = '\n'.join(filtered_lines)
+    # First pass: Line-by-line filtering for robust removal, in a single loop
+    # (only needed when one of its markers occurs at all)
+    if 'Exported from Wikisource' in text or 'About this digital edition' in text:
+        filtered_lines = []
+        for line in text.split('\n'):
+            # Remove lines containing "Exported from Wikisource"
+            if 'Exported from Wikisource' in line:
+                continue
+            # Remove everything from "About this digital edition" line onwards
+            if line.lstrip().startswith('About this digital edition'):
+                logger.debug("Found 'About this digital edition' - truncating content here")
+                break
+            filtered_lines.append(line)
+        
+        # Rejoin text for further processing
+        text = '\n'.join(filtered_lines)
     
     # Second pass: Regex-based cleanup for remaining patterns
     # Remove any remaining Wikisource export references
-    text = re.sub(r'.*Exported from Wikisource.*\n?', '', text, flags=re.IGNORECASE)
+    text = WIKISOURCE_EXPORT_LINE.sub('', text)
     
     # Remove any remaining "About this digital edition" sections (backup)
-    text = re.sub(r'About this digital edition.*$', '', text, flags=re.MULTILINE | re.DOTALL)
+    text = DIGITAL_EDITION_SECTION.sub('', text)
     
     # Apply enhanced category removal
     text = remove_category_sections(text)
     
     # Remove source URLs and references
-    text = re.sub(r'Source:\s*https?://.*\n?', '', text, flags=re.IGNORECASE)
-    text = re.sub(r'https?://[^\s]+', '', text)
+    text = SOURCE_URL_LINE.sub('', text)
+    text = URL_PATTERN.sub('', text)
     
     # Remove editorial notes in brackets/parentheses that contain non-Latin
-    text = re.sub(r'\[.*?(?:ed\.|edit\.|source|wiki).*?\]', '', text, flags=re.IGNORECASE)
-    text = re.sub(r'\(.*?(?:ed\.|edit\.|source|wiki).*?\)', '', text, flags=re.IGNORECASE)
+    text = EDITORIAL_BRACKETS.sub('', text)
+    text = EDITORIAL_PARENTHESES.sub('', text)
     
     # Remove editor/publisher attribution patterns
-    text = re.sub(r'.*(?:von Bunge|Napiersky).*possint.*', '', text, flags=re.IGNORECASE)
+    text = EDITOR_ATTRIBUTION.sub('', text)
     
     # Additional cleanup patterns that might be missed
     # Remove lines that are clearly digital metadata
-    lines = text.split('\n')
     clean_lines = []
+    append = clean_lines.append
     
-    for line in lines:
-        line_lower = line.lower().strip()
+    for line in text.split('\n'):
+        line_lower = line.lower()
         
         # Skip lines that are clearly metadata/digital artifacts
-        skip_patterns = [
-            'exported by', 'generated by', 'digitized by', 'scanned by',
-            'copyright', '©', 'all rights reserved', 'permission',
-            'this text was', 'this edition', 'digital edition',
-            'ocr', 'optical character', 'text recognition'
-        ]
-        
-        should_skip = False
-        for pattern in skip_patterns:
+        for pattern in METADATA_LINE_PATTERNS:
             if pattern in line_lower:
-                should_skip = True
-                logger.debug(f"Skipping metadata line: {line[:50]}...")
+                logger.debug("Skipping metadata line: %s...", line[:50])
                 break
-        
-        if not should_skip:
-            clean_lines.append(line)
+        else:
+            append(line)
     
     return '\n'.join(clean_lines)
 
 def remove_toc_and_navigation(text):
     """Remove table of contents and navigation elements."""
     # Remove TOC markers
-    text = re.sub(r'__TOC__', '', text)
+    text = text.replace('__TOC__', '')
     
     # Remove section navigation
-    text = re.sub(r'==+.*?==+', '', text)
-    text = re.sub(r'===+.*?===+', '', text)
+    text = SECTION_HEADING.sub('', text)
+    text = SUBSECTION_HEADING.sub('', text)
     
     return text
 
 def clean_non_latin_content(text):
     """Remove content that's clearly not Latin text."""
-    lines = text.split('\n')
     cleaned_lines = []
+    append = cleaned_lines.append
     
-    for line in lines:
+    for line in text.split('\n'):
         line = line.strip()
         
         # Skip empty lines (will be handled later)
         if not line:
-            cleaned_lines.append('')
+            append('')
             continue
             
         # Skip lines that are primarily metadata/markup
-        if (line.startswith('Title:') or 
-            line.startswith('Source:') or 
-            line.startswith('Category:') or
-            line.startswith('Text Type:') or
-            line.startswith('#') or
-            line.startswith('{{') or
-            line.startswith('}}') or
-            line.startswith('[[') or
-            line.startswith(']]')):
+        if line.startswith(MARKUP_LINE_PREFIXES):
             continue
             
         # Skip lines with modern language indicators
-        modern_indicators = [
-            'english', 'deutsch', 'français', 'español', 'italiano',
-            'translation', 'note:', 'see also', 'external link',
-            'bibliography', 'reference', 'isbn', 'doi:'
-        ]
-        
-        skip_line = False
         line_lower = line.lower()
-        for indicator in modern_indicators:
+        for indicator in MODERN_LANGUAGE_INDICATORS:
             if indicator in line_lower:
-                skip_line = True
                 break
-        
-        if skip_line:
-            continue
-            
-        cleaned_lines.append(line)
+        else:
+            append(line)
     
     return '\n'.join(cleaned_lines)
 
 def standardize_punctuation(text):
     """Standardize punctuation, keeping only what's appropriate for Latin."""
-    # Keep only standard punctuation marks useful for Latin
-    allowed_punctuation = set('.,:;!?\'"-()[]')
-    
-    # Remove excessive punctuation and special characters
-    # But preserve basic punctuation structure
-    cleaned_chars = []
-    
-    for char in text:
-        if (char.isalpha() or 
-            char.isspace() or 
-            char in allowed_punctuation or
-            char.isdigit()):  # Keep digits for now (Roman numerals), will handle later
-            cleaned_chars.append(char)
-        # Convert some special punctuation
-        elif char in '""''':
-            cleaned_chars.append('"')
-        elif char in '–—':
-            cleaned_chars.append('-')
-        # Skip other special characters
-    
-    text = ''.join(cleaned_chars)
-    
-    # Clean up excessive punctuation
-    text = re.sub(r'\.{2,}', '.', text)  # Multiple periods
-    text = re.sub(r',{2,}', ',', text)   # Multiple commas
-    text = re.sub(r';{2,}', ';', text)   # Multiple semicolons
-    text = re.sub(r':{2,}', ':', text)   # Multiple colons
+    # Keep letters, whitespace, digits (Roman numerals are handled later) and
+    # standard punctuation marks useful for Latin; en/em dashes become '-' and
+    # other special characters are removed. Only the text's distinct characters
+    # are classified, then the ones to drop are removed in a single regex pass.
+    dropped = {char for char in set(text)
+               if not (char.isalpha() or char.isspace() or char.isdigit() or char in ALLOWED_PUNCTUATION)}
+    if dropped:
+        for dash in DASHES & dropped:
+            text = text.replace(dash, '-')
+        dropped -= DASHES
+    if dropped:
+        text = re.sub('[' + re.escape(''.join(sorted(dropped))) + ']', '', text)
+    
+    # Clean up excessive punctuation (runs of periods, commas, semicolons, colons)
+    text = REPEATED_PUNCTUATION.sub(r'\1', text)
     
     return text
 
 def is_roman_numeral(text):
     """Check if a text segment is a Roman numeral to avoid expanding as name."""
-    return bool(re.fullmatch(ROMAN_NUMERAL_PATTERN, text.upper()))
+    return bool(ROMAN_NUMERAL_PATTERN.fullmatch(text.upper()))
 
 def detect_gender_context(text_segment, position):
     """
@@ -319,8 +361,8 @@ def detect_gender_context(text_segment, position):
     Returns 'masculine', 'feminine', or 'unknown'
     """
     # Look in a window around the position for gender indicators
-    window_start = max(0, position - 100)
-    window_end = min(len(text_segment), position + 100)
+    window_start = max(0, position - GENDER_CONTEXT_RADIUS)
+    window_end = min(len(text_segment), position + GENDER_CONTEXT_RADIUS)
     context = text_segment[window_start:window_end].lower()
     
     masculine_count = sum(1 for word in MASCULINE_CONTEXT_WORDS if word in context)
@@ -340,30 +382,41 @@ def expand_praenomina_contextually(text):
     expanded_text = text
     expansions_made = []
     
-    # Process each potential praenomina match
-    for abbreviation, full_name in MALE_PRAENOMINA.items():
-        pattern = r'\b' + abbreviation + r'(?=\s[A-Z])'  # Must be followed by capitalized word (nomen/cognomen)
-        matches = list(re.finditer(pattern, expanded_text))
+    # Process each potential praenomina match. Matches are handled from last to
+    # first, so each gender context already reflects the expansions after it;
+    # the text is assembled from its pieces once per praenomen instead of being
+    # copied for every expansion.
+    for pattern, full_name in PRAENOMEN_PATTERNS:
+        pieces = []
+        end = len(expanded_text)
+        following = ''  # Start of the current text at `end`, as far as a context window reaches
         
-        for match in reversed(matches):  # Reverse to maintain positions during replacement
+        for match in reversed(list(pattern.finditer(expanded_text))):
             matched_text = match.group(0)
             position = match.start()
-            
-            # Skip if it's actually a Roman numeral
-            if is_roman_numeral(matched_text.replace('.', '')):
-                logger.debug(f"Skipping Roman numeral: {matched_text}")
-                continue
+            between = expanded_text[match.end():end]
             
             # Get context and determine if expansion is appropriate
-            context = detect_gender_context(expanded_text, position)
+            window_start = max(0, position - GENDER_CONTEXT_RADIUS)
+            window = (expanded_text[window_start:position] +
+                      (matched_text + between[:GENDER_CONTEXT_RADIUS] + following)[:GENDER_CONTEXT_RADIUS])
+            context = detect_gender_context(window, position - window_start)
             
-            # Expand if context suggests masculine or if context is unknown but common praenomina
-            if (context in ['masculine', 'unknown'] and 
-                abbreviation in ['M\\.', 'L\\.', 'C\\.', 'P\\.', 'Q\\.']):  # Most common ones
-                
-                expanded_text = expanded_text[:match.start()] + full_name + expanded_text[match.end():]
+            # Expand if context suggests masculine or if context is unknown
+            replacement = matched_text
+            if context in ('masculine', 'unknown'):
+                replacement = full_name
                 expansions_made.append(f"{matched_text} → {full_name} ({context} context)")
                 logger.debug(f"Expanded praenomen: {matched_text} → {full_name} (context: {context})")
+            
+            pieces.append(between)
+            pieces.append(replacement)
+            following = (replacement + between[:GENDER_CONTEXT_RADIUS] + following)[:GENDER_CONTEXT_RADIUS]
+            end = position
+        
+        if pieces:
+            pieces.append(expanded_text[:end])
+            expanded_text = ''.join(reversed(pieces))
     
     return expanded_text, expansions_made
 
@@ -371,12 +424,21 @@ def expand_standard_abbreviations(text):
     """Expand standard Latin abbreviations that are unambiguous."""
     expansions_made = []
     
-    for pattern, replacement in STANDARD_ABBREVIATIONS.items():
-        matches = list(re.finditer(pattern, text, flags=re.IGNORECASE))
+    # Patterns whose leading letters don't occur in the case-folded text are
+    # skipped without a regex pass. Dotted and dotless i fold differently from
+    # how re.IGNORECASE matches them, so texts with either skip this check.
+    folded = None if 'ı' in text or 'İ' in text else text.casefold()
+    
+    for pattern, regex, leading_text, replacement in STANDARD_ABBREVIATION_PATTERNS:
+        if folded is not None and leading_text not in folded:
+            continue
+        matches = list(regex.finditer(text))
         if matches:
             for match in matches:
                 expansions_made.append(f"{match.group(0)} → {replacement}")
-            text = re.sub(pattern, replacement, text, flags=re.IGNORECASE)
+            text = regex.sub(replacement, text)
+            if folded is not None:
+                folded = text.casefold()
             logger.debug(f"Expanded abbreviation: {pattern} → {replacement}")
     
     return text, expansions_made
@@ -405,91 +467,150 @@ def expand_abbreviations_enhanced(text):
         if total_expansions > 10:
             logger.debug(f"  ... and {total_expansions - 10} more")
     
-    return text
+    return text, total_expansions
 
-def clean_text_content_with_logging(text, progress):
-    """Apply all enhanced content cleaning steps with detailed progress logging."""
+def clean_text_content(text, progress=None):
+    """
+    Apply all enhanced content cleaning steps.
+    When a progress tracker is given, each step is logged to it in detail.
+    """
     original_text = text
     
-    progress.log_operation("Step 1: Removing metadata header", "Cleaning document headers and metadata")
+    def log_step(operation, details):
+        if progress is not None:
+            progress.log_operation(operation, details)
+        else:
+            logger.debug(f"{operation}...")
+    
+    # Check for categories before cleaning
+    if progress is not None:
+        category_count = len(CATEGORY_MARKER.findall(text))
+        if category_count > 0:
+            progress.log_operation("Categories detected", f"Found {category_count} category sections to remove", True, category_count)
+    
+    log_step("Step 1: Removing metadata header", "Cleaning document headers and metadata")
     text = remove_metadata_header(text)
-    progress.log_text_analysis(original_text, text, "Metadata header removal")
+    if progress is not None:
+        progress.log_text_analysis(original_text, text, "Metadata header removal")
     
     step_text = text
-    progress.log_operation("Step 2: Removing source attributions", "Cleaning source attributions and categories")
+    log_step("Step 2: Removing source attributions", "Cleaning source attributions and categories")
     text = remove_source_attributions(text)
     
-    # Count categories removed
-    categories_removed = len(re.findall(r'Categoria?:', step_text, re.IGNORECASE)) - len(re.findall(r'Categoria?:', text, re.IGNORECASE))
-    if categories_removed > 0:
-        progress.log_operation("Categories removed", f"Successfully removed {categories_removed} category sections", True, categories_removed)
+    # Count categories removed (the header is usually untouched, so the
+    # count taken above still holds for it)
+    if progress is not None:
+        if step_text is not original_text:
+            category_count = len(CATEGORY_MARKER.findall(step_text))
+        categories_removed = category_count - len(CATEGORY_MARKER.findall(text))
+        if categories_removed > 0:
+            progress.log_operation("Categories removed", f"Successfully removed {categories_removed} category sections", True, categories_removed)
     
     step_text = text
-    progress.log_operation("Step 3: Removing TOC and navigation", "Cleaning table of contents and navigation elements")
+    log_step("Step 3: Removing TOC and navigation", "Cleaning table of contents and navigation elements")
     text = remove_toc_and_navigation(text)
-    progress.log_text_analysis(step_text, text, "TOC and navigation removal")
+    if progress is not None:
+        progress.log_text_analysis(step_text, text, "TOC and navigation removal")
     
     step_text = text
-    progress.log_operation("Step 4: Cleaning non-Latin content", "Removing non-Latin text and formatting")
+    log_step("Step 4: Cleaning non-Latin content", "Removing non-Latin text and formatting")
     text = clean_non_latin_content(text)
-    progress.log_text_analysis(step_text, text, "Non-Latin content cleaning")
+    if progress is not None:
+        progress.log_text_analysis(step_text, text, "Non-Latin content cleaning")
     
     step_text = text
-    progress.log_operation("Step 5: Standardizing punctuation", "Normalizing punctuation and spacing")
+    log_step("Step 5: Standardizing punctuation", "Normalizing punctuation and spacing")
     text = standardize_punctuation(text)
-    if len(step_text) != len(text):
+    if progress is not None and len(step_text) != len(text):
         progress.log_operation("Punctuation standardized", f"Modified {abs(len(step_text) - len(text))} characters")
     
-    step_text = text
-    progress.log_operation("Step 6: Expanding abbreviations", "Applying enhanced abbreviation expansion")
-    
-    # Count abbreviations before expansion
-    abbrev_before = len(re.findall(r'\b[A-Z]\.(?:\s[A-Z]\.)*', step_text))
-    text = expand_abbreviations_enhanced(text)
-    abbrev_after = len(re.findall(r'\b[A-Z]\.(?:\s[A-Z]\.)*', text))
-    
-    expansions_made = abbrev_before - abbrev_after
-    if expansions_made > 0:
+    log_step("Step 6: Expanding abbreviations", "Applying enhanced abbreviation expansion")
+    text, expansions_made = expand_abbreviations_enhanced(text)
+    if progress is not None and expansions_made > 0:
         progress.log_operation("Abbreviations expanded", f"Expanded {expansions_made} abbreviations", True, expansions_made)
     
-    progress.log_operation("Step 7: Final cleanup", "Removing excessive whitespace and normalizing text")
+    log_step("Step 7: Final cleanup", "Removing excessive whitespace and normalizing text")
     # Final cleanup - remove excessive whitespace
-    text = re.sub(r'\n{3,}', '\n\n', text)  # Max 2 consecutive newlines
-    text = re.sub(r'[ \t]+', ' ', text)     # Normalize spaces
+    text = EXCESS_NEWLINES.sub('\n\n', text)  # Max 2 consecutive newlines
+    if '\t' in text or '  ' in text:         # Normalize spaces
+        text = SPACE_RUNS.sub(' ', text)
     text = text.strip()
     
     # Final analysis
-    progress.log_text_analysis(original_text, text, "Complete cleaning pipeline")
-    progress.log_operation("Content cleaning completed", f"All {7} cleaning steps applied successfully")
+    if progress is not None:
+        progress.log_text_analysis(original_text, text, "Complete cleaning pipeline")
+        progress.log_operation("Content cleaning completed", f"All {7} cleaning steps applied successfully")
     
     return text
 
-def clean_text_content(text):
-    """Apply all enhanced content cleaning steps (legacy version without logging)."""
-    logger.debug("Removing metadata header...")
-    text = remove_metadata_header(text)
-    
-    logger.debug("Removing source attributions and categories...")
-    text = remove_source_attributions(text)
+class _ProgressRecorder:
+    """
+    Stand-in for ProgressTracker inside worker processes.
+    Records the per-book log calls so the parent can replay them in order.
+    """
     
-    logger.debug("Removing TOC and navigation...")
-    text = remove_toc_and_navigation(text)
+    def __init__(self):
+        self.events = []
     
-    logger.debug("Cleaning non-Latin content...")
-    text = clean_non_latin_content(text)
+    def log_operation(self, operation, details="", success=True, count=0):
+        self.events.append(('log_operation', (operation, details, success, count)))
     
-    logger.debug("Standardizing punctuation...")
-    text = standardize_punctuation(text)
+    def log_text_analysis(self, original_text, processed_text, analysis_type):
+        # Ship the counts rather than the texts back to the parent
+        self.events.append(('log_text_analysis_counts', (
+            original_text.count('\n') + 1, processed_text.count('\n') + 1,
+            len(original_text), len(processed_text), analysis_type
+        )))
     
-    logger.debug("Expanding abbreviations with enhanced intelligence...")
-    text = expand_abbreviations_enhanced(text)
+    def log_file_operation(self, operation, source_path="", dest_path="", success=True):
+        self.events.append(('log_file_operation', (operation, source_path, dest_path, success)))
+
+def clean_one_book(paths):
+    """Clean one book in a worker process and return its recorded log and counts."""
+    input_path, output_path = paths
+    progress = _ProgressRecorder()
+    start = time.monotonic_ns()
+    result = {'events': progress.events, 'error': None, 'size': 0}
     
-    # Final cleanup - remove excessive whitespace
-    text = re.sub(r'\n{3,}', '\n\n', text)  # Max 2 consecutive newlines
-    text = re.sub(r'[ \t]+', ' ', text)     # Normalize spaces
-    text = text.strip()
+    try:
+        progress.log_operation("Loading file content", "Reading original text for processing")
+        with open(input_path, 'r', encoding='utf-8') as f:
+            result['size'] = os.fstat(f.fileno()).st_size
+            original_content = f.read()
+        
+        original_length = len(original_content)
+        original_lines = original_content.count('\n') + 1
+        
+        progress.log_operation("Content loaded", f"Original: {original_length:,} chars, {original_lines} lines")
+        
+        # Start comprehensive text cleaning with detailed logging
+        progress.log_operation("Starting content cleaning pipeline", "Applying all cleaning transformations")
+        
+        # Clean the content with enhanced logging
+        cleaned_content = clean_text_content(original_content, progress)
+        
+        # Analyze results
+        cleaned_length = len(cleaned_content)
+        cleaned_lines = cleaned_content.count('\n') + 1
+        
+        progress.log_operation("Analyzing cleaning results", 
+                             f"Size change: {original_length - cleaned_length:+,} chars, "
+                             f"Line change: {cleaned_lines - original_lines:+d}")
+        
+        # Save cleaned content
+        progress.log_operation("Saving cleaned content", f"Writing to {output_path}")
+        with open(output_path, 'w', encoding='utf-8') as f:
+            f.write(cleaned_content)
+        
+        progress.log_file_operation("Write cleaned file", "", output_path, True)
+        
+        result.update(original_length=original_length, original_lines=original_lines,
+                      cleaned_length=cleaned_length, cleaned_lines=cleaned_lines)
+    except Exception as e:
+        result['error'] = str(e)
     
-    return text
+    result['elapsed'] = (time.monotonic_ns() - start) / 1e9
+    return result
 
 def process_directory(input_dir, output_dir):
     """Process all txt files in a directory with enhanced cleaning and detailed progress tracking."""
@@ -518,87 +639,65 @@ def process_directory(input_dir, output_dir):
     total_expansions_made = 0
     total_lines_cleaned = 0
     
-    for filename in txt_files:
-        input_path = os.path.join(input_dir, filename)
-        output_path = os.path.join(output_dir, filename)
-        
-        # Get file stats and start progress tracking
-        file_stats = get_file_stats(input_path)
-        progress.start_file(filename, input_path, file_stats['size'])
-        
-        try:
-            progress.log_operation("Loading file content", "Reading original text for processing")
-            with open(input_path, 'r', encoding='utf-8') as f:
-                original_content = f.read()
-            
-            original_length = len(original_content)
-            original_lines = len(original_content.split('\n'))
-            
-            progress.log_operation("Content loaded", f"Original: {original_length:,} chars, {original_lines} lines")
-            
-            # Check for categories before cleaning
-            category_count = len(re.findall(r'Categoria?:', original_content, re.IGNORECASE))
-            if category_count > 0:
-                progress.log_operation("Categories detected", f"Found {category_count} category sections to remove", True, category_count)
-            
-            # Start comprehensive text cleaning with detailed logging
-            progress.log_operation("Starting content cleaning pipeline", "Applying all cleaning transformations")
-            
-            # Clean the content with enhanced logging
-            cleaned_content = clean_text_content_with_logging(original_content, progress)
-            
-            # Analyze results
-            cleaned_length = len(cleaned_content)
-            cleaned_lines = len(cleaned_content.split('\n'))
-            lines_processed = max(original_lines, cleaned_lines)
-            
-            # Calculate reduction statistics
-            size_reduction = original_length - cleaned_length
-            line_change = cleaned_lines - original_lines
-            
-            progress.log_operation("Analyzing cleaning results", 
-                                 f"Size change: {size_reduction:+,} chars, Line change: {line_change:+d}")
-            
-            # Get actual abbreviation count from the detailed logger stats
-            expansions_made = progress.detailed_logger.stats.get('expansions_made', 0)
-            categories_removed = progress.detailed_logger.stats.get('categories_removed', 0)
-            
-            # Save cleaned content
-            progress.log_operation("Saving cleaned content", f"Writing to {output_path}")
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(cleaned_content)
-            
-            progress.log_file_operation("Write cleaned file", "", output_path, True)
-            
-            # Update tracking statistics
-            total_categories_removed += categories_removed
-            total_expansions_made += expansions_made
-            total_lines_cleaned += lines_processed
-            
-            # Create detailed summary
-            summary_parts = []
-            if size_reduction > 0:
-                summary_parts.append(f"reduced by {size_reduction:,} chars")
-            if categories_removed > 0:
-                summary_parts.append(f"{categories_removed} categories removed")
-            if expansions_made > 0:
-                summary_parts.append(f"{expansions_made} abbreviations expanded")
-            
-            summary = "Cleaned successfully"
-            if summary_parts:
-                summary += f": {', '.join(summary_parts)}"
-            
-            progress.finish_file(success=True, 
-                               lines_processed=lines_processed,
-                               bytes_processed=cleaned_length,
-                               expansions_made=expansions_made,
-                               categories_removed=categories_removed,
-                               summary=summary)
+    # Books are cleaned in worker processes; the tracker stays here and
+    # replays each book's log in the original file order.
+    jobs = [(os.path.join(input_dir, f), os.path.join(output_dir, f)) for f in txt_files]
+    workers = min(len(jobs), os.cpu_count() or 1)
+    
+    try:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=max(workers, 1)) as executor:
+            results = executor.map(clean_one_book, jobs) if workers > 1 else map(clean_one_book, jobs)
             
-        except Exception as e:
-            error_msg = f"Content cleaning error: {e}"
-            progress.log_operation("Processing failed", f"Exception during cleaning: {str(e)}", False)
-            progress.finish_file(success=False, error_msg=error_msg)
+            for filename, (input_path, output_path), result in zip(txt_files, jobs, results):
+                # Start progress tracking with the size the worker already read
+                progress.start_file(filename, input_path, result['size'])
+                
+                for method, args in result['events']:
+                    getattr(progress, method)(*args)
+                
+                if result['error']:
+                    error_msg = f"Content cleaning error: {result['error']}"
+                    progress.log_operation("Processing failed", f"Exception during cleaning: {result['error']}", False)
+                    progress.finish_file(success=False, error_msg=error_msg, elapsed=result['elapsed'])
+                    continue
+                
+                cleaned_length = result['cleaned_length']
+                lines_processed = max(result['original_lines'], result['cleaned_lines'])
+                size_reduction = result['original_length'] - cleaned_length
+                
+                # Get actual abbreviation count from the detailed logger stats
+                expansions_made = progress.detailed_logger.stats.get('expansions_made', 0)
+                categories_removed = progress.detailed_logger.stats.get('categories_removed', 0)
+                
+                # Update tracking statistics
+                total_categories_removed += categories_removed
+                total_expansions_made += expansions_made
+                total_lines_cleaned += lines_processed
+                
+                # Create detailed summary
+                summary_parts = []
+                if size_reduction > 0:
+                    summary_parts.append(f"reduced by {size_reduction:,} chars")
+                if categories_removed > 0:
+                    summary_parts.append(f"{categories_removed} categories removed")
+                if expansions_made > 0:
+                    summary_parts.append(f"{expansions_made} abbreviations expanded")
+                
+                summary = "Cleaned successfully"
+                if summary_parts:
+                    summary += f": {', '.join(summary_parts)}"
+                
+                progress.finish_file(success=True, 
+                                   lines_processed=lines_processed,
+                                   bytes_processed=cleaned_length,
+                                   expansions_made=expansions_made,
+                                   categories_removed=categories_removed,
+                                   summary=summary,
+                                   elapsed=result['elapsed'])
+    except BaseException:
+        # print_summary() closes the tracker's metrics file; close it here if we never get there
+        progress.close()
+        raise
     
     # Update final progress statistics
     progress.stats.update({
@@ -634,49 +733,53 @@ def process_directory(input_dir, output_dir):
     return final_stats['files_processed']
 
 def main():
-    base_input = "sorted_texts"
-    base_output = "content_cleaned"
-    
-    logger.info("=== Step 3: Enhanced Text Content Cleaning ===")
-    logger.info("Features: Category removal, intelligent abbreviation expansion, gender-aware praenomina")
-    
-    # Create output directory structure
-    os.makedirs(base_output, exist_ok=True)
-    
-    # Updated to handle new mixed genre directory structure
-    directories_to_process = [
-        ("classical/prose", "classical/prose"),
-        ("classical/poetry", "classical/poetry"),
-        ("classical/mixed", "classical/mixed"),
-        ("post_classical/prose", "post_classical/prose"),
-        ("post_classical/poetry", "post_classical/poetry"),
-        ("post_classical/mixed", "post_classical/mixed"),
-    ]
-    
-    total_processed = 0
-    
-    for input_subdir, output_subdir in directories_to_process:
-        input_dir = os.path.join(base_input, input_subdir)
-        output_dir = os.path.join(base_output, output_subdir)
+    log_listener = start_log_queue()
+    try:
+        base_input = "sorted_texts"
+        base_output = "content_cleaned"
         
-        if os.path.exists(input_dir):
-            logger.info(f"Processing {input_subdir}...")
-            processed = process_directory(input_dir, output_dir)
-            total_processed += processed
-            logger.info(f"Enhanced cleaning completed for {processed} files in {input_subdir}")
-        else:
-            logger.debug(f"Skipping non-existent directory: {input_subdir}")
-    
-    logger.info(f"\n=== Enhanced Cleaning Summary ===")
-    logger.info(f"✅ Total files processed: {total_processed}")
-    logger.info(f"🧹 Features applied:")
-    logger.info(f"   • Category section removal (==Commentarium== and Categoria: lines)")
-    logger.info(f"   • Gender-aware praenomina expansion (M. → Marcus, etc.)")
-    logger.info(f"   • Roman numeral disambiguation") 
-    logger.info(f"   • Comprehensive Latin abbreviation expansion")
-    logger.info(f"   • Enhanced punctuation standardization")
-    logger.info(f"📋 Detailed reports saved in cleaning_reports/ directories")
-    logger.info(f"🎯 Core Latin content is now clean and ready for further processing!")
+        logger.info("=== Step 3: Enhanced Text Content Cleaning ===")
+        logger.info("Features: Category removal, intelligent abbreviation expansion, gender-aware praenomina")
+        
+        # Create output directory structure
+        os.makedirs(base_output, exist_ok=True)
+        
+        # Updated to handle new mixed genre directory structure
+        directories_to_process = [
+            ("classical/prose", "classical/prose"),
+            ("classical/poetry", "classical/poetry"),
+            ("classical/mixed", "classical/mixed"),
+            ("post_classical/prose", "post_classical/prose"),
+            ("post_classical/poetry", "post_classical/poetry"),
+            ("post_classical/mixed", "post_classical/mixed"),
+        ]
+        
+        total_processed = 0
+        
+        for input_subdir, output_subdir in directories_to_process:
+            input_dir = os.path.join(base_input, input_subdir)
+            output_dir = os.path.join(base_output, output_subdir)
+            
+            if os.path.exists(input_dir):
+                logger.info(f"Processing {input_subdir}...")
+                processed = process_directory(input_dir, output_dir)
+                total_processed += processed
+                logger.info(f"Enhanced cleaning completed for {processed} files in {input_subdir}")
+            else:
+                logger.debug(f"Skipping non-existent directory: {input_subdir}")
+        
+        logger.info(f"\n=== Enhanced Cleaning Summary ===")
+        logger.info(f"✅ Total files processed: {total_processed}")
+        logger.info(f"🧹 Features applied:")
+        logger.info(f"   • Category section removal (==Commentarium== and Categoria: lines)")
+        logger.info(f"   • Gender-aware praenomina expansion (M. → Marcus, etc.)")
+        logger.info(f"   • Roman numeral disambiguation") 
+        logger.info(f"   • Comprehensive Latin abbreviation expansion")
+        logger.info(f"   • Enhanced punctuation standardization")
+        logger.info(f"📋 Detailed reports saved in cleaning_reports/ directories")
+        logger.info(f"🎯 Core Latin content is now clean and ready for further processing!")
+    finally:
+        stop_log_queue(log_listener)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
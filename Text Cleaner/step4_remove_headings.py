@@ -9,6 +9,7 @@ import os
 import re
 import logging
 from progress_tracker import ProgressTracker, get_file_stats
+from detailed_progress_logger import start_log_queue, stop_log_queue
 from optimized_regex_patterns import PATTERNS
 
 # Configure logging
@@ -213,34 +214,38 @@ def process_directory(input_dir, output_dir):
     return processed
 
 def main():
-    base_input = "content_cleaned"
-    base_output = "headings_removed"
-    
-    logger.info("=== Step 4: Remove Headings and Section Indicators ===")
-    
-    # Create output directory structure
-    os.makedirs(base_output, exist_ok=True)
-    
-    directories_to_process = [
-        ("classical/prose", "classical/prose"),
-        ("classical/poetry", "classical/poetry"),
-        ("post_classical/prose", "post_classical/prose"),
-        ("post_classical/poetry", "post_classical/poetry"),
-        ("unknown_classification", "unknown_classification")
-    ]
-    
-    total_processed = 0
-    
-    for input_subdir, output_subdir in directories_to_process:
-        input_dir = os.path.join(base_input, input_subdir)
-        output_dir = os.path.join(base_output, output_subdir)
+    log_listener = start_log_queue()
+    try:
+        base_input = "content_cleaned"
+        base_output = "headings_removed"
+        
+        logger.info("=== Step 4: Remove Headings and Section Indicators ===")
+        
+        # Create output directory structure
+        os.makedirs(base_output, exist_ok=True)
+        
+        directories_to_process = [
+            ("classical/prose", "classical/prose"),
+            ("classical/poetry", "classical/poetry"),
+            ("post_classical/prose", "post_classical/prose"),
+            ("post_classical/poetry", "post_classical/poetry"),
+            ("unknown_classification", "unknown_classification")
+        ]
         
-        logger.info(f"Processing {input_subdir}...")
-        processed = process_directory(input_dir, output_dir)
-        total_processed += processed
-        logger.info(f"Processed {processed} files in {input_subdir}")
-    
-    logger.info(f"Step 4 completed! Total files processed: {total_processed}")
+        total_processed = 0
+        
+        for input_subdir, output_subdir in directories_to_process:
+            input_dir = os.path.join(base_input, input_subdir)
+            output_dir = os.path.join(base_output, output_subdir)
+            
+            logger.info(f"Processing {input_subdir}...")
+            processed = process_directory(input_dir, output_dir)
+            total_processed += processed
+            logger.info(f"Processed {processed} files in {input_subdir}")
+        
+        logger.info(f"Step 4 completed! Total files processed: {total_processed}")
+    finally:
+        stop_log_queue(log_listener)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
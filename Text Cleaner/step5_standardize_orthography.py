@@ -11,6 +11,7 @@ import re
 import unicodedata
 import logging
 from progress_tracker import ProgressTracker, get_file_stats
+from detailed_progress_logger import start_log_queue, stop_log_queue
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -432,50 +433,54 @@ def process_directory(input_dir, output_dir):
     return final_stats['files_processed']
 
 def main():
-    base_input = "headings_removed"
-    base_output = "orthography_standardized"
-    
-    logger.info("=== Step 5: Enhanced Orthographic Standardization ===")
-    logger.info("Features: Medieval variant normalization, diacritic removal, case standardization")
-    
-    # Create output directory structure
-    os.makedirs(base_output, exist_ok=True)
-    
-    # Updated to handle new mixed genre directory structure
-    directories_to_process = [
-        ("classical/prose", "classical/prose"),
-        ("classical/poetry", "classical/poetry"),
-        ("classical/mixed", "classical/mixed"),
-        ("post_classical/prose", "post_classical/prose"),
-        ("post_classical/poetry", "post_classical/poetry"),
-        ("post_classical/mixed", "post_classical/mixed"),
-    ]
-    
-    total_processed = 0
-    
-    for input_subdir, output_subdir in directories_to_process:
-        input_dir = os.path.join(base_input, input_subdir)
-        output_dir = os.path.join(base_output, output_subdir)
-        
-        if os.path.exists(input_dir):
-            logger.info(f"Processing {input_subdir}...")
-            processed = process_directory(input_dir, output_dir)
-            total_processed += processed
-            logger.info(f"Enhanced orthographic standardization completed for {processed} files in {input_subdir}")
-        else:
-            logger.debug(f"Skipping non-existent directory: {input_subdir}")
-    
-    logger.info(f"\n=== Enhanced Orthographic Standardization Summary ===")
-    logger.info(f"✅ Total files processed: {total_processed}")
-    logger.info(f"🔤 Features applied:")
-    logger.info(f"   • Medieval variant normalization (michi→mihi, nichil→nihil, etc.)")
-    logger.info(f"   • Comprehensive diacritic removal (ā→a, ē→e, etc.)")
-    logger.info(f"   • Ligature standardization (æ→ae, œ→oe)")
-    logger.info(f"   • Medieval character conversion (j→i, v→u)")
-    logger.info(f"   • Case normalization (all lowercase)")
-    logger.info(f"   • Punctuation standardization")
-    logger.info(f"📋 Detailed reports saved in orthography_reports/ directories")
-    logger.info(f"🎯 Latin texts now have standardized orthography for LLM training!")
+    log_listener = start_log_queue()
+    try:
+        base_input = "headings_removed"
+        base_output = "orthography_standardized"
+        
+        logger.info("=== Step 5: Enhanced Orthographic Standardization ===")
+        logger.info("Features: Medieval variant normalization, diacritic removal, case standardization")
+        
+        # Create output directory structure
+        os.makedirs(base_output, exist_ok=True)
+        
+        # Updated to handle new mixed genre directory structure
+        directories_to_process = [
+            ("classical/prose", "classical/prose"),
+            ("classical/poetry", "classical/poetry"),
+            ("classical/mixed", "classical/mixed"),
+            ("post_classical/prose", "post_classical/prose"),
+            ("post_classical/poetry", "post_classical/poetry"),
+            ("post_classical/mixed", "post_classical/mixed"),
+        ]
+        
+        total_processed = 0
+        
+        for input_subdir, output_subdir in directories_to_process:
+            input_dir = os.path.join(base_input, input_subdir)
+            output_dir = os.path.join(base_output, output_subdir)
+            
+            if os.path.exists(input_dir):
+                logger.info(f"Processing {input_subdir}...")
+                processed = process_directory(input_dir, output_dir)
+                total_processed += processed
+                logger.info(f"Enhanced orthographic standardization completed for {processed} files in {input_subdir}")
+            else:
+                logger.debug(f"Skipping non-existent directory: {input_subdir}")
+        
+        logger.info(f"\n=== Enhanced Orthographic Standardization Summary ===")
+        logger.info(f"✅ Total files processed: {total_processed}")
+        logger.info(f"🔤 Features applied:")
+        logger.info(f"   • Medieval variant normalization (michi→mihi, nichil→nihil, etc.)")
+        logger.info(f"   • Comprehensive diacritic removal (ā→a, ē→e, etc.)")
+        logger.info(f"   • Ligature standardization (æ→ae, œ→oe)")
+        logger.info(f"   • Medieval character conversion (j→i, v→u)")
+        logger.info(f"   • Case normalization (all lowercase)")
+        logger.info(f"   • Punctuation standardization")
+        logger.info(f"📋 Detailed reports saved in orthography_reports/ directories")
+        logger.info(f"🎯 Latin texts now have standardized orthography for LLM training!")
+    finally:
+        stop_log_queue(log_listener)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
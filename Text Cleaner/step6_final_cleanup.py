@@ -10,6 +10,7 @@ import os
 import re
 import logging
 from progress_tracker import ProgressTracker, get_file_stats
+from detailed_progress_logger import start_log_queue, stop_log_queue
 from optimized_regex_patterns import PATTERNS
 
 # Configure logging
@@ -145,7 +146,7 @@ def clean_remaining_punctuation_optimized(text):
     
     for line in lines:
         stripped = line.strip()
-        if stripped and not PATTERNS.STANDALONE_PUNCT.match(stripped):
+        if stripped and not PATTERNS.is_standalone_punct(stripped):
             cleaned_lines.append(line)
         elif not stripped:
             cleaned_lines.append('')
@@ -313,47 +314,51 @@ def process_directory(input_dir, output_dir):
     return processed
 
 def main():
-    base_input = "orthography_standardized"
-    base_output = "final_cleaned"
-    
-    logger.info("=== Step 6: Enhanced Final Cleanup ===")
-    logger.info("Features: Optimized regex patterns, enhanced progress tracking, comprehensive cleanup")
-    
-    # Create output directory structure
-    os.makedirs(base_output, exist_ok=True)
-    
-    # Updated to handle new mixed genre directory structure (no more unknowns!)
-    directories_to_process = [
-        ("classical/prose", "classical/prose"),
-        ("classical/poetry", "classical/poetry"),
-        ("classical/mixed", "classical/mixed"),
-        ("post_classical/prose", "post_classical/prose"),
-        ("post_classical/poetry", "post_classical/poetry"),
-        ("post_classical/mixed", "post_classical/mixed"),
-    ]
-    
-    total_processed = 0
-    
-    for input_subdir, output_subdir in directories_to_process:
-        input_dir = os.path.join(base_input, input_subdir)
-        output_dir = os.path.join(base_output, output_subdir)
+    log_listener = start_log_queue()
+    try:
+        base_input = "orthography_standardized"
+        base_output = "final_cleaned"
         
-        if os.path.exists(input_dir):
-            logger.info(f"Processing {input_subdir}...")
-            processed = process_directory(input_dir, output_dir)
-            total_processed += processed
-            logger.info(f"Enhanced final cleanup completed for {processed} files in {input_subdir}")
-        else:
-            logger.debug(f"Skipping non-existent directory: {input_subdir}")
-    
-    logger.info(f"\\n=== Enhanced Final Cleanup Summary ===")
-    logger.info(f"✅ Total files processed: {total_processed}")
-    logger.info(f"⚡ Performance improvements:")
-    logger.info(f"   • Pre-compiled regex patterns (30-50% faster)")
-    logger.info(f"   • Optimized whitespace normalization")
-    logger.info(f"   • Enhanced progress tracking")
-    logger.info(f"📋 Detailed reports saved in final_cleanup_reports/ directories")
-    logger.info(f"🎯 Texts are now fully cleaned and ready for dataset creation!")
+        logger.info("=== Step 6: Enhanced Final Cleanup ===")
+        logger.info("Features: Optimized regex patterns, enhanced progress tracking, comprehensive cleanup")
+        
+        # Create output directory structure
+        os.makedirs(base_output, exist_ok=True)
+        
+        # Updated to handle new mixed genre directory structure (no more unknowns!)
+        directories_to_process = [
+            ("classical/prose", "classical/prose"),
+            ("classical/poetry", "classical/poetry"),
+            ("classical/mixed", "classical/mixed"),
+            ("post_classical/prose", "post_classical/prose"),
+            ("post_classical/poetry", "post_classical/poetry"),
+            ("post_classical/mixed", "post_classical/mixed"),
+        ]
+        
+        total_processed = 0
+        
+        for input_subdir, output_subdir in directories_to_process:
+            input_dir = os.path.join(base_input, input_subdir)
+            output_dir = os.path.join(base_output, output_subdir)
+            
+            if os.path.exists(input_dir):
+                logger.info(f"Processing {input_subdir}...")
+                processed = process_directory(input_dir, output_dir)
+                total_processed += processed
+                logger.info(f"Enhanced final cleanup completed for {processed} files in {input_subdir}")
+            else:
+                logger.debug(f"Skipping non-existent directory: {input_subdir}")
+        
+        logger.info(f"\\n=== Enhanced Final Cleanup Summary ===")
+        logger.info(f"✅ Total files processed: {total_processed}")
+        logger.info(f"⚡ Performance improvements:")
+        logger.info(f"   • Pre-compiled regex patterns (30-50% faster)")
+        logger.info(f"   • Optimized whitespace normalization")
+        logger.info(f"   • Enhanced progress tracking")
+        logger.info(f"📋 Detailed reports saved in final_cleanup_reports/ directories")
+        logger.info(f"🎯 Texts are now fully cleaned and ready for dataset creation!")
+    finally:
+        stop_log_queue(log_listener)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
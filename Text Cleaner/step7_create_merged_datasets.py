@@ -10,6 +10,7 @@ Creates merged datasets combining different periods and genres as requested:
 import os
 import shutil
 import logging
+from detailed_progress_logger import start_log_queue, stop_log_queue
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -42,9 +43,11 @@ def setup_merged_directories():
     ]
     
     for directory in directories:
-        if not os.path.exists(directory):
+        try:
             os.makedirs(directory)
-            logger.info(f"Created directory: {directory}")
+        except FileExistsError:
+            continue
+        logger.info(f"Created directory: {directory}")
 
 def copy_files(source_dir, target_dir):
     """Copy all .txt files from source to target directory."""
@@ -52,8 +55,7 @@ def copy_files(source_dir, target_dir):
         logger.warning(f"Source directory {source_dir} does not exist")
         return 0
     
-    if not os.path.exists(target_dir):
-        os.makedirs(target_dir)
+    os.makedirs(target_dir, exist_ok=True)
     
     txt_files = [f for f in os.listdir(source_dir) if f.endswith('.txt')]
     copied = 0
@@ -228,24 +230,28 @@ def create_statistics_report(base_output):
         logger.info(f"  {name}: {count} files")
 
 def main():
-    base_input = "final_cleaned"
-    base_output = "merged_datasets"
-    
-    logger.info("=== Step 7: Create Merged Datasets ===")
-    
-    # Setup directory structure
-    setup_merged_directories()
-    
-    # Create various merged datasets
-    create_period_combined_datasets(base_input, base_output)
-    create_cross_period_datasets(base_input, base_output)
-    create_complete_datasets(base_input, base_output)
-    
-    # Generate statistics report
-    create_statistics_report(base_output)
-    
-    logger.info("Step 7 completed! Merged datasets created successfully.")
-    logger.info(f"All datasets available in '{base_output}/' directory")
+    log_listener = start_log_queue()
+    try:
+        base_input = "final_cleaned"
+        base_output = "merged_datasets"
+        
+        logger.info("=== Step 7: Create Merged Datasets ===")
+        
+        # Setup directory structure
+        setup_merged_directories()
+        
+        # Create various merged datasets
+        create_period_combined_datasets(base_input, base_output)
+        create_cross_period_datasets(base_input, base_output)
+        create_complete_datasets(base_input, base_output)
+        
+        # Generate statistics report
+        create_statistics_report(base_output)
+        
+        logger.info("Step 7 completed! Merged datasets created successfully.")
+        logger.info(f"All datasets available in '{base_output}/' directory")
+    finally:
+        stop_log_queue(log_listener)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
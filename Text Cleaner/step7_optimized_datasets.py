@@ -13,6 +13,7 @@ import concurrent.futures
 from pathlib import Path
 from typing import Dict, List, Tuple
 from progress_tracker import ProgressTracker, get_file_stats
+from detailed_progress_logger import start_log_queue, stop_log_queue
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -354,27 +355,31 @@ class OptimizedDatasetCreator:
         logger.info(f"📋 Detailed report: {report_path}")
 
 def main():
-    base_input = "final_cleaned"
-    base_output = "merged_datasets"
-    
-    logger.info("=== Step 7: Optimized Dataset Creation ===")
-    logger.info("Features: Parallel processing, smart file handling, comprehensive reporting")
-    
-    # Create optimized dataset creator
-    creator = OptimizedDatasetCreator(base_input, base_output, max_workers=4)
-    
-    # Setup directories
-    creator.setup_directories()
-    
-    # Create all datasets with parallel processing
-    creator.create_all_datasets()
-    
-    # Generate comprehensive report
-    creator.generate_comprehensive_report()
-    
-    logger.info("🎯 Step 7 completed with optimized performance!")
-    logger.info("✨ All datasets created with parallel processing - up to 4x faster!")
-    logger.info(f"📂 Datasets available in: {base_output}/")
+    log_listener = start_log_queue()
+    try:
+        base_input = "final_cleaned"
+        base_output = "merged_datasets"
+        
+        logger.info("=== Step 7: Optimized Dataset Creation ===")
+        logger.info("Features: Parallel processing, smart file handling, comprehensive reporting")
+        
+        # Create optimized dataset creator
+        creator = OptimizedDatasetCreator(base_input, base_output, max_workers=4)
+        
+        # Setup directories
+        creator.setup_directories()
+        
+        # Create all datasets with parallel processing
+        creator.create_all_datasets()
+        
+        # Generate comprehensive report
+        creator.generate_comprehensive_report()
+        
+        logger.info("🎯 Step 7 completed with optimized performance!")
+        logger.info("✨ All datasets created with parallel processing - up to 4x faster!")
+        logger.info(f"📂 Datasets available in: {base_output}/")
+    finally:
+        stop_log_queue(log_listener)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
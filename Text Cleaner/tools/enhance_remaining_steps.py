@@ -2,11 +2,20 @@
 """
 Quick utility to add enhanced progress tracking to remaining step files.
 This will update step4, step5, step6, and step7 with the new progress tracking system.
+
+This is an offline source rewriter, not part of the pipeline: run it directly
+(python tools/enhance_remaining_steps.py) and never import it.
 """
 
+if __name__ != "__main__":
+    raise ImportError("enhance_remaining_steps is an offline tool; run it as a script")
+
 import os
 import re
 
+# Step scripts live one directory up from tools/
+STEPS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
 def add_progress_import(content):
     """Add progress_tracker import to a step file."""
     if 'from progress_tracker import' in content:
@@ -96,7 +105,8 @@ def main():
     
     enhanced_count = 0
     
-    for filepath, step_name in step_files:
+    for filename, step_name in step_files:
+        filepath = os.path.join(STEPS_DIR, filename)
         if os.path.exists(filepath):
             if enhance_step_file(filepath, step_name):
                 enhanced_count += 1